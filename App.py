@@ -14,18 +14,21 @@ Run:
 # ----------------------------
 # Imports
 # ----------------------------
+# Only what the first paint needs comes first; pandas, NumPy and the data
+# modules are imported once the header is on screen (see "Lesson and lab
+# imports" below), and Altair / Pillow load inside the tabs that use them.
 import streamlit as st
-import pandas as pd
-import numpy as np
-import altair as alt
 import io
 from datetime import date, datetime
+from time import perf_counter
 import base64
 import textwrap
-import random
-from PIL import Image, ImageDraw, ImageFont
 from typing import List, Tuple, Dict
 
+from hub.profiling import panel_enabled, render_performance_panel, section, start_run
+from hub.router import TabRegistry
+from hub.theme import DEFAULT_ACCENT, apply_theme, save_custom_theme, themes
+
 # ----------------------------
 # Page config & session state
 # ----------------------------
@@ -33,125 +36,116 @@ st.set_page_config(page_title="Excel + Power BI Learning Hub",
                    page_icon="📊",
                    layout="wide",
                    initial_sidebar_state="expanded")
+profile = start_run()  # None unless ?perf=1 or HUB_PROFILE is set (see hub/profiling.py)
 
 if "username" not in st.session_state:
     st.session_state.username = "Ashwik Bire"
 if "accent" not in st.session_state:
-    st.session_state.accent = "#8A2BE2"
+    st.session_state.accent = DEFAULT_ACCENT
 if "passed_quiz" not in st.session_state:
     st.session_state.passed_quiz = False
 if "quiz_scores" not in st.session_state:
     st.session_state.quiz_scores = {}
 
+sales_rows_slot = st.sidebar.container()  # filled once hub.datasets is imported
+
 # ----------------------------
-# Utilities
+# UI: Theme, header and accent selector
 # ----------------------------
-def inject_css(accent: str = "#8A2BE2"):
-    """Inject CSS for colorful UI and tabs"""
-    tab_gradients = [
-        "linear-gradient(135deg, #8A2BE2 0%, #6A5ACD 100%)",
-        "linear-gradient(135deg, #FF8C00 0%, #FF6B6B 100%)",
-        "linear-gradient(135deg, #00B3B3 0%, #1E90FF 100%)",
-        "linear-gradient(135deg, #39D353 0%, #2AB3A6 100%)",
-        "linear-gradient(135deg, #FF3B7F 0%, #FF7F50 100%)",
-        "linear-gradient(135deg, #9966FF 0%, #8A2BE2 100%)",
-        "linear-gradient(135deg, #1E90FF 0%, #00BFFF 100%)",
-        "linear-gradient(135deg, #FF6B6B 0%, #FFA07A 100%)",
-        "linear-gradient(135deg, #2AB3A6 0%, #20C997 100%)",
-        "linear-gradient(135deg, #FFD166 0%, #FF8C00 100%)",
-        "linear-gradient(135deg, #6EE7B7 0%, #3B82F6 100%)",
-        "linear-gradient(135deg, #F472B6 0%, #8B5CF6 100%)"
-    ]
-    css = f"""
-    <style>
-    :root {{
-        --accent: {accent};
-    }}
-    .stApp {{
-        background: radial-gradient(900px 600px at 10% -10%, rgba(138,43,226,0.08), transparent 40%),
-                    radial-gradient(900px 600px at 110% 10%, rgba(30,144,255,0.06), transparent 40%),
-                    linear-gradient(135deg, #071018, #081020 60%);
-        color: #e8eef8;
-        font-family: 'Segoe UI', Roboto, Helvetica, Arial, sans-serif;
-    }}
-    .card {{
-        background: rgba(255,255,255,0.03);
-        border: 1px solid rgba(255,255,255,0.05);
-        padding: 14px;
-        border-radius: 12px;
-        margin-bottom: 12px;
-    }}
-    .headline {{
-        font-weight:700;
-    }}
-    .divider {{ height:1px; background: rgba(255,255,255,0.04); margin:12px 0; border-radius:2px; }}
-    .stButton>button {{
-        background: var(--accent) !important;
-        color: white !important;
-        border-radius: 10px !important;
-    }}
-    /* Tabs per-child background */
-    .stTabs [role="tablist"] > div:nth-child(1) button {{ background: {tab_gradients[0]}; }}
-    .stTabs [role="tablist"] > div:nth-child(2) button {{ background: {tab_gradients[1]}; }}
-    .stTabs [role="tablist"] > div:nth-child(3) button {{ background: {tab_gradients[2]}; }}
-    .stTabs [role="tablist"] > div:nth-child(4) button {{ background: {tab_gradients[3]}; }}
-    .stTabs [role="tablist"] > div:nth-child(5) button {{ background: {tab_gradients[4]}; }}
-    .stTabs [role="tablist"] > div:nth-child(6) button {{ background: {tab_gradients[5]}; }}
-    .stTabs [role="tablist"] > div:nth-child(7) button {{ background: {tab_gradients[6]}; }}
-    .stTabs [role="tablist"] > div:nth-child(8) button {{ background: {tab_gradients[7]}; }}
-    .stTabs [role="tablist"] > div:nth-child(9) button {{ background: {tab_gradients[8]}; }}
-    .stTabs [role="tablist"] > div:nth-child(10) button {{ background: {tab_gradients[9]}; }}
-    .stTabs [role="tablist"] > div:nth-child(11) button {{ background: {tab_gradients[10]}; }}
-    .stTabs [role="tablist"] > div:nth-child(12) button {{ background: {tab_gradients[11]}; }}
-    </style>
-    """
-    st.markdown(css, unsafe_allow_html=True)
-
-inject_css(st.session_state.accent)
+def save_theme_from_form():
+    """Form callback: runs before the script, so it may select the new theme."""
+    name = st.session_state.ct_name.strip() or "Custom"
+    save_custom_theme(name, st.session_state.ct_accent, st.session_state.ct_start, st.session_state.ct_end)
+    st.session_state.theme_choice = name
+
+with section("Theme"):
+    THEMES = themes()
+    if st.session_state.get("theme_choice") not in THEMES:
+        st.session_state.theme_choice = next(iter(THEMES))
+    theme = THEMES[st.session_state.theme_choice]
+    st.session_state.accent = theme.accent
+    apply_theme(theme)  # once per full run; fragment reruns keep it
 
+    with st.sidebar.expander("Custom theme"):
+        with st.form("custom_theme_form"):
+            st.text_input("Theme name", "My theme", key="ct_name")
+            st.color_picker("Accent", DEFAULT_ACCENT, key="ct_accent")
+            st.color_picker("Section gradient start", "#8A2BE2", key="ct_start")
+            st.color_picker("Section gradient end", "#1E90FF", key="ct_end")
+            st.form_submit_button("Save theme", on_click=save_theme_from_form)
+
+with section("Header"):
+    col_a, col_b = st.columns([0.75, 0.25])
+    with col_a:
+        st.markdown(f"<h1 class='headline'>📘 Excel + 📊 Power BI Learning Hub</h1>", unsafe_allow_html=True)
+        st.markdown(f"<div style='color: #cfe8ff'>Hello, <b>{st.session_state.username}</b> — use the sections below to explore lessons, labs, quizzes and projects.</div>", unsafe_allow_html=True)
+    with col_b:
+        st.selectbox("Theme Accent", list(THEMES), key="theme_choice")
+
+    st.markdown("<div class='divider'></div>", unsafe_allow_html=True)
+
+# ----------------------------
+# Lesson and lab imports (after the first paint)
+# ----------------------------
+import pandas as pd
+import numpy as np
+
+from hub.datasets import (DEFAULT_HR_ROWS, DEFAULT_SEED, HR_ROW_OPTIONS, MONTHS, PEOPLE, REGIONS,
+                          SALES_ROW_OPTIONS, load_hr_df, load_sales_df)
+from hub.admin import admin_enabled, render_admin_panel
+from hub.charts import CHARTS, show_chart, show_payload
+from hub.cube import load_sales_cube
+from hub.dax import LAB_MEASURES, PANDAS_EQUIVALENTS, DaxError, load_lab_model, split_definition
+from hub.export import XLSX_OFFER_ROWS, available_formats, export_bytes, file_name, lazy_export, mime_type
+from hub.filters import load_sales_index
+from hub.grading import PASS_MARK, answer_sheet_template, grade_answer_csv, grade_sheet
+from hub.hr_analytics import RISK_WEIGHTS, TENURE_HALF_LIFE, hr_chart, load_hr_analytics
+from hub.power_query import Query, infer_types, stats_frame
+from hub.quiz import load_quiz_bank
+
+# ----------------------------
+# Utilities
+# ----------------------------
 def df_to_csv_bytes(df: pd.DataFrame) -> bytes:
-    return df.to_csv(index=False).encode('utf-8')
+    return export_bytes(df, "CSV")
+
+# Other widget values are kept per section (see hub/router.py); uploads cannot be.
+UPLOAD_RESET_HELP = "The file is cleared when you switch to another section."
+
+def make_download_button(label: str, data, file_name: str, mime: str = "application/octet-stream"):
+    """``data`` may be bytes or a zero-arg callable that is only run on click."""
+    st.download_button(label, data=data, file_name=file_name, mime=mime, on_click="ignore")
+
+def file_download(fh):
+    """Deferred download data for an open (spooled) file: read back only on click."""
+    def read() -> bytes:
+        fh.seek(0)
+        return fh.read()
+    return read
 
-def make_download_button(label: str, data: bytes, file_name: str, mime: str = "application/octet-stream"):
-    st.download_button(label, data=data, file_name=file_name, mime=mime)
+def export_download(label: str, stem: str, key: tuple, frame, n_rows: int, widget_key: str):
+    """Format picker + lazy download button; the file is built (and cached) on click."""
+    fmt = st.selectbox("Format", available_formats(n_rows), key=f"{widget_key}_fmt",
+                       help=(f"XLSX is offered up to {XLSX_OFFER_ROWS:,} rows; larger tables take minutes to write."
+                             if n_rows > XLSX_OFFER_ROWS else None))
+    make_download_button(f"{label} ({fmt})", lazy_export(key, fmt, frame),
+                         file_name(stem, fmt), mime_type(fmt))
 
-def image_bytes_to_download(image: Image.Image, filename="image.png"):
+def image_bytes_to_download(image, filename="image.png"):
+    """PNG bytes of a PIL image."""
     buf = io.BytesIO()
     image.save(buf, format="PNG")
     buf.seek(0)
     return buf.getvalue()
 
 # ----------------------------
-# Sample data generation
-# ----------------------------
-np.random.seed(42)
-people = ["Aarav", "Isha", "Vihaan", "Diya", "Kabir", "Anaya", "Advait", "Myra", "Vivaan", "Sara"]
-regions = ["North", "South", "East", "West"]
-months = pd.date_range("2024-01-01", periods=12, freq="MS").strftime("%b").tolist()
-
-sales_rows = []
-for m in months:
-    for p in people:
-        units = int(np.random.randint(5, 60))
-        price = int(np.random.choice([99, 199, 299, 399, 499]))
-        sales_rows.append({
-            "Month": m,
-            "Person": p,
-            "Region": random.choice(regions),
-            "Units": units,
-            "Price": price,
-            "Revenue": units * price
-        })
-sales_df = pd.DataFrame(sales_rows)
+# Sample data size (frames are loaded after the header, see hub/datasets.py)
+# ----------------------------
+people, regions, months = PEOPLE, REGIONS, MONTHS
+DISPLAY_ROWS = 1000  # cap for st.dataframe previews on scaled datasets
 
-hr_df = pd.DataFrame({
-    "Employee": [f"E{i:03d}" for i in range(1, 201)],
-    "Dept": np.random.choice(["Finance", "Sales", "Ops", "HR", "IT"], 200),
-    "Level": np.random.choice(["Junior", "Mid", "Senior"], 200, p=[0.5, 0.35, 0.15]),
-    "Salary": np.random.randint(25000, 250000, 200),
-    "JoinDate": pd.to_datetime(np.random.choice(pd.date_range("2016-01-01", "2025-07-01"), 200)),
-    "Performance": np.random.choice(["A", "B", "C"], 200, p=[0.2, 0.6, 0.2])
-})
+sales_rows = sales_rows_slot.selectbox("Sample sales rows", SALES_ROW_OPTIONS, index=0,
+                                      format_func=lambda n: f"{n:,}", key="sales_rows")
 
 # ----------------------------
 # Knowledge content
@@ -234,115 +228,33 @@ RESOURCE_LINKS = [
 ]
 
 # ----------------------------
-# Quiz bank (100+ MCQs)
-# We'll create 100 questions combining Excel/Power BI/DAX/Power Query knowledge.
-# ----------------------------
-class MCQ:
-    def __init__(self, question: str, options: List[str], correct_index: int, explanation: str = ""):
-        self.question = question
-        self.options = options
-        self.correct_index = correct_index
-        self.explanation = explanation
-
-def build_quiz_bank() -> List[MCQ]:
-    bank = []
-    # Core Excel questions
-    bank.append(MCQ("Which function replaces VLOOKUP with more flexibility?",
-                    ["MATCH", "XLOOKUP", "INDEX", "FILTER"], 1, "XLOOKUP handles vertical/horizontal lookups with more options."))
-    bank.append(MCQ("Which function returns unique values from a range in Excel 365?",
-                    ["UNIQUE", "DISTINCT", "REMOVE.DUPES", "VALUES"], 0, "UNIQUE spills distinct values."))
-    bank.append(MCQ("How do you freeze top row in Excel?", ["View > Freeze Panes", "Data > Freeze", "Home > Freeze", "Insert > Freeze"], 0, "Freeze Panes under View allows freezing top rows/columns."))
-    bank.append(MCQ("Which Excel function safely handles division by zero with an alternate result?",
-                    ["IFERROR", "ERROR.TYPE", "DIVIDE", "IF"], 2, "DIVIDE(value, divisor, alternateResult) avoids divide-by-zero errors."))
-    bank.append(MCQ("Which of these is a dynamic array function?", ["VLOOKUP", "SEQUENCE", "INDEX", "SUMIFS"], 1, "SEQUENCE is a dynamic array function introduced in Excel 365."))
-    # Power Query / M
-    bank.append(MCQ("Power Query step to stack two tables vertically is called?",
-                    ["Merge Queries", "Append Queries", "Join Queries", "Combine Rows"], 1, "Append stacks tables (vertical)."))
-    bank.append(MCQ("Which step converts first row to headers in Power Query?", ["Promote Headers", "Use First Row As Headers", "Headerify", "Promote"], 0, "Promote Headers uses the first row as column headers."))
-    # Power BI / Modeling
-    bank.append(MCQ("In Power BI, date intelligence typically requires:",
-                    ["No Date Table", "A dedicated Date table", "Only fact table", "Only DAX"], 1, "A dedicated Date table enables time-intelligence calculations."))
-    bank.append(MCQ("Which storage mode keeps data in the source and queries live?", ["Import", "DirectQuery", "Dual", "CloudQuery"], 1, "DirectQuery queries the source live."))
-    # DAX
-    bank.append(MCQ("Which DAX function calculates Year-over-Year using shifted dates?",
-                    ["DATEADD", "DATESYTD", "SAMEPERIODLASTYEAR", "PARALLELPERIOD"], 0, "DATEADD shifts dates by intervals (e.g., -1 year)."))
-    bank.append(MCQ("Which DAX function divides safely handling division by zero?",
-                    ["/", "DIVIDE", "QUOTIENT", "IFERROR"], 1, "DIVIDE handles division by zero with optional alternate result."))
-    # Add many more questions programmatically to reach 100
-    # We'll programmatically generate variations (careful to keep realism)
-    extras = [
-        ("Which Excel shortcut toggles filters?", ["Ctrl+T", "Ctrl+Shift+L", "Alt+F4", "Ctrl+F"], 1),
-        ("What does 'Remove Duplicates' do?", ["Deletes rows", "Deletes columns", "Removes duplicate rows based on selected columns", "Sorts data"], 2),
-        ("What is a star schema?", ["Normalized schema", "Denormalized fact-dimension schema", "Only dimension tables", "No relationships"], 1),
-        ("TopN function in DAX returns", ["Top rows based on measure", "All rows", "Only bottom rows", "Unique values"], 0),
-        ("Power Query 'Unpivot' converts", ["Rows to columns", "Columns to rows", "Merges tables", "Splits columns"], 1),
-        ("Which Excel formula would you use to combine text from multiple cells with delimiter?", ["CONCAT", "TEXTJOIN", "JOIN", "MERGE"], 1),
-        ("In Power BI, what is an aggregation table used for?", ["Visuals only", "Summarized queries for performance", "Security", "Formatting"], 1),
-        ("Which DAX function removes filter context?", ["FILTER", "ALL", "CALCULATE", "KEEPFILTERS"], 1),
-        ("Which Excel view shows gridlines off for presentations?", ["Normal", "Page Layout", "Page Break Preview", "Page Layout with grid off"], 1),
-        ("Which of these is NOT a recommended visual practice?", ["One insight per visual", "Too many colors", "Use consistent colors", "Sort bars by value"], 1),
-    ]
-    for q, opts, idx in extras:
-        bank.append(MCQ(q, opts, idx))
-    # Programmatic questions (to pad up to 100)
-    # We'll create variations about months, functions, shortcuts
-    func_questions = [
-        ("SUM", "Returns the sum of numbers."),
-        ("AVERAGE", "Returns the mean."),
-        ("COUNT", "Counts numeric entries."),
-        ("COUNTIF", "Counts based on condition."),
-        ("SUMIFS", "Sums based on multiple criteria."),
-        ("INDEX", "Returns value by row/column index."),
-        ("MATCH", "Finds position of a value."),
-        ("VLOOKUP", "Vertical lookup (less flexible than XLOOKUP)."),
-        ("HLOOKUP", "Horizontal lookup."),
-        ("OFFSET", "Returns a range offset from reference."),
-        ("INDIRECT", "Returns reference from text."),
-    ]
-    for name, desc in func_questions:
-        bank.append(MCQ(f"What does the Excel function {name} do?",
-                        ["Aggregation", "Lookup", desc, "Text operation"], 2))
-    # Add duplicate/shuffle to reach count
-    while len(bank) < 120:  # overshoot a bit for choice
-        k = random.choice(func_questions)
-        bank.append(MCQ(f"What does the Excel function {k[0]} do?",
-                        ["Math", "Lookup", k[1], "Formatting"], 2))
-    # Trim to 100-110
-    return bank[:110]
-
-QUIZ_BANK = build_quiz_bank()
-
-# ----------------------------
-# UI: Header and accent selector
-# ----------------------------
-col_a, col_b = st.columns([0.75, 0.25])
-with col_a:
-    st.markdown(f"<h1 class='headline'>📘 Excel + 📊 Power BI Learning Hub</h1>", unsafe_allow_html=True)
-    st.markdown(f"<div style='color: #cfe8ff'>Hello, <b>{st.session_state.username}</b> — use the tabs to explore lessons, labs, quizzes and projects.</div>", unsafe_allow_html=True)
-with col_b:
-    accent_choice = st.selectbox("Theme Accent", ["Aurora", "Mango", "Lagoon", "Rose", "Lime", "Ocean", "Sunset"], index=0)
-    accent_map = {
-        "Aurora": "#8A2BE2", "Mango": "#FF8C00", "Lagoon": "#00B3B3",
-        "Rose": "#FF3B7F", "Lime": "#39D353", "Ocean": "#1E90FF", "Sunset": "#FF6B6B"
-    }
-    st.session_state.accent = accent_map.get(accent_choice, "#8A2BE2")
-    inject_css(st.session_state.accent)
-
-st.markdown("<div class='divider'></div>", unsafe_allow_html=True)
-
-# ----------------------------
-# Tabs (single page)
-# ----------------------------
-tabs = st.tabs([
-    "Home", "Excel Basics", "Excel Functions", "Power Query",
-    "Power BI Basics", "DAX Lab", "Charts Gallery", "Datasets",
-    "Mini Projects", "Quiz", "Shortcuts", "Cheat Sheets", "Certificate"
-])
+# Data and quiz bank: loaded after the header so the page paints first
+# (datasets may come from an on-disk snapshot, see hub/snapshot.py)
+# ----------------------------
+with section("Sample data"):
+    sales_df = load_sales_df(sales_rows, DEFAULT_SEED)
+    sales_index = load_sales_index(sales_rows, DEFAULT_SEED)
+    sales_cube = load_sales_cube(sales_rows, DEFAULT_SEED)
+    hr_df = load_hr_df(DEFAULT_HR_ROWS, DEFAULT_SEED)
+
+# ----------------------------
+# Quiz bank (100+ MCQs across Excel / Power Query / DAX / Power BI)
+# Questions live in hub/assets/quiz_bank.json; the bank is built once per
+# server process and shared by every session (see hub/quiz.py).
+# ----------------------------
+with section("Quiz bank"):
+    QUIZ_BANK = load_quiz_bank()
+
+# ----------------------------
+# Tabs (single page, rendered lazily — see hub/router.py)
+# ----------------------------
+TABS = TabRegistry()
 
 # ----------------------------
 # HOME Tab
 # ----------------------------
-with tabs[0]:
+@TABS.tab("Home")
+def render_home():
     left, right = st.columns([0.65, 0.35])
     with left:
         st.subheader("Welcome")
@@ -361,14 +273,15 @@ with tabs[0]:
         5. Projects → Build end-to-end dashboards
         """)
     with right:
-        st.metric("Total Sample Revenue", f"₹ {sales_df['Revenue'].sum():,}")
+        st.metric("Total Sample Revenue", f"₹ {sales_cube.total('Revenue'):,}")
         st.metric("Sample Employees", f"{len(hr_df)}")
         st.metric("People Covered", f"{len(people)}")
 
 # ----------------------------
 # EXCEL BASICS Tab
 # ----------------------------
-with tabs[1]:
+@TABS.tab("Excel Basics", state=["basics_"])
+def render_excel_basics():
     st.header("Excel Basics — Tables, Formatting, Lookups")
     col1, col2 = st.columns([0.6, 0.4])
     with col1:
@@ -376,16 +289,20 @@ with tabs[1]:
         for tip in EXCEL_TIPS:
             st.markdown(f"- {tip}")
         st.markdown("#### Table & Filtering Demo")
-        month_filter = st.selectbox("Month", ["(All)"] + months)
-        region_filter = st.multiselect("Region", options=regions, default=regions)
-        person_filter = st.selectbox("Person", ["(All)"] + sorted(people))
-        df = sales_df.copy()
-        if month_filter != "(All)":
-            df = df[df["Month"] == month_filter]
-        if person_filter != "(All)":
-            df = df[df["Person"] == person_filter]
-        df = df[df["Region"].isin(region_filter)]
-        st.dataframe(df, use_container_width=True, height=320)
+        month_filter = st.selectbox("Month", ["(All)"] + months, key="basics_month")
+        region_filter = st.multiselect("Region", options=regions, default=regions, key="basics_region")
+        person_filter = st.selectbox("Person", ["(All)"] + sorted(people), key="basics_person")
+        df = sales_index.filter({
+            "Month": None if month_filter == "(All)" else [month_filter],
+            "Person": None if person_filter == "(All)" else [person_filter],
+            "Region": region_filter,
+        })
+        st.dataframe(df.head(DISPLAY_ROWS), use_container_width=True, height=320)
+        if len(df) > DISPLAY_ROWS:
+            st.caption(f"Showing first {DISPLAY_ROWS:,} of {len(df):,} matching rows.")
+        export_download("Download filtered rows", "sales_filtered",
+                        ("sales", sales_rows, DEFAULT_SEED, month_filter, person_filter, tuple(region_filter)),
+                        lambda: df, len(df), "basics_export")
     with col2:
         st.subheader("Common Functions")
         for n, f in [("XLOOKUP", "=XLOOKUP(lookup_value, lookup_array, return_array, [if_not_found])"),
@@ -397,21 +314,359 @@ with tabs[1]:
 # ----------------------------
 # EXCEL FUNCTIONS Tab
 # ----------------------------
-with tabs[2]:
+@TABS.tab("Excel Functions", state=["func_"])
+def render_excel_functions():
     st.header("Excel Functions — Hands-on Lab")
     left, right = st.columns([0.55, 0.45])
     with left:
         st.subheader("Lookup Playground")
         t_month = st.selectbox("Select Month", months, index=0, key="func_month")
         t_person = st.selectbox("Select Person", sorted(people), key="func_person")
-        subset = sales_df[(sales_df["Month"] == t_month) & (sales_df["Person"] == t_person)]
-        if not subset.empty:
-            st.success(f"Revenue: ₹ {int(subset['Revenue'].sum()):,}")
+        lookup = {"Month": t_month, "Person": t_person}
+        if sales_cube.count(lookup):
+            st.success(f"Revenue: ₹ {sales_cube.sum('Revenue', lookup):,}")
         else:
             st.info("No rows found for that selection.")
         st.markdown("#### UNIQUE / FILTER demo")
-        st.write(sorted(sales_df["Region"].unique()))
+        st.write(sorted(sales_index.values("Region")))
     with right:
         st.subheader("Sequence & Dynamic Array Demo")
-        n = st.slider("Generate sequence up to n", 5, 100, 12)
-        seq = pd.DataFrame({"n": np.arange(1, n+1), "n^2": np.arange(1, n+1)**2, "n^3": 
\ No newline at end of file
+        n = st.slider("Generate sequence up to n", 5, 100, 12, key="func_n")
+        seq = pd.DataFrame({"n": np.arange(1, n+1), "n^2": np.arange(1, n+1)**2, "n^3": np.arange(1, n+1)**3})
+        st.dataframe(seq, use_container_width=True, height=320)
+
+# ----------------------------
+# POWER QUERY Tab
+# ----------------------------
+@TABS.tab("Power Query", state=["pq_fill", "pq_split", "pq_delim", "pq_dedupe", "pq_keys", "pq_sums"])
+def render_power_query():
+    st.header("Power Query — Clean & Shape")
+    left, right = st.columns([0.35, 0.65])
+    with left:
+        st.subheader("Common Steps")
+        for i, step in enumerate(POWER_QUERY_STEPS, start=1):
+            st.markdown(f"{i}. {step}")
+    with right:
+        st.subheader("Run a Recipe")
+        upload = st.file_uploader("CSV or Excel file (leave empty to use the sample sales data)",
+                                  type=["csv", "xlsx"], key="pq_file", help=UPLOAD_RESET_HELP)
+        try:
+            if upload is None:
+                query = Query.frame(sales_df, name="Source (sample sales)")
+            else:
+                sample = Query.file(upload, upload.name, chunk_rows=200).promote_headers().preview(200)
+                query = Query.file(upload, upload.name).promote_headers().change_types(infer_types(sample))
+            preview = query.preview(5)
+        except (ImportError, ValueError, pd.errors.ParserError) as e:
+            st.error(f"Could not read the file: {e}")
+            return
+        columns = list(preview.columns)
+        numeric = [c for c in columns if pd.api.types.is_numeric_dtype(preview[c])]
+        fill = st.multiselect("Fill Down", columns, key="pq_fill")
+        c1, c2 = st.columns(2)
+        split_col = c1.selectbox("Split Column", ["(none)"] + columns, key="pq_split")
+        delimiter = c2.text_input("Delimiter", " ", key="pq_delim")
+        if fill:
+            query = query.fill_down(fill)
+        if split_col != "(none)" and delimiter:
+            query = query.split_column(split_col, delimiter)
+            at = columns.index(split_col)
+            columns = columns[:at] + [f"{split_col}.1", f"{split_col}.2"] + columns[at + 1:]
+        dedupe = st.multiselect("Remove Duplicates on", columns, key="pq_dedupe",
+                                help="Leave empty to keep duplicate rows.")
+        keys = st.multiselect("Group By", columns, key="pq_keys")
+        sums = st.multiselect("Sum", [c for c in numeric if c not in keys], key="pq_sums")
+        if dedupe:
+            query = query.remove_duplicates(dedupe)
+        if keys:
+            aggs = {f"Sum of {c}": (c, "sum") for c in sums}
+            query = query.group_by(keys, {**aggs, "Rows": (keys[0], "rows")})
+        st.caption("Applied steps: " + " → ".join(query.step_names))
+        if st.button("Run recipe", key="pq_run"):
+            try:
+                with st.spinner("Streaming the query..."):
+                    head, result_file, stats = query.run(preview_rows=DISPLAY_ROWS)
+            except (ValueError, TypeError, KeyError) as e:
+                st.error(f"Step failed: {e}")
+                return
+            st.dataframe(stats_frame(stats), use_container_width=True, hide_index=True)
+            st.dataframe(head, use_container_width=True, height=320)
+            make_download_button("Download result (CSV)", file_download(result_file), "query_result.csv", "text/csv")
+
+# ----------------------------
+# POWER BI BASICS Tab
+# ----------------------------
+@TABS.tab("Power BI Basics")
+def render_powerbi_basics():
+    st.header("Power BI Basics — Model & Visual Best Practices")
+    for tip in POWERBI_TIPS:
+        st.markdown(f"- {tip}")
+
+# ----------------------------
+# DAX LAB Tab
+# ----------------------------
+@TABS.tab("DAX Lab", state=["dax_"])
+def render_dax_lab():
+    st.header("DAX Lab — Measures & Time Intelligence")
+    left, right = st.columns([0.6, 0.4])
+    with left:
+        st.subheader("Measure Playground")
+        st.caption("Model: Sales (Month, Person, Region, Units, Price, Revenue) → 'Date' (Date, Month, MonthNo, Year) "
+                   "on Month, plus HR (Employee, Dept, Level, Salary, JoinDate, Performance).")
+        model = load_lab_model(sales_rows, DEFAULT_SEED, DEFAULT_HR_ROWS)
+        choice = st.selectbox("Measure", list(LAB_MEASURES) + ["(Custom)"], key="dax_measure")
+        default = f"{choice} = {LAB_MEASURES[choice]}" if choice in LAB_MEASURES else "My Measure = SUM(Sales[Units])"
+        text = st.text_area("DAX", default, key=f"dax_expr_{choice}", height=90)
+        s1, s2, s3 = st.columns(3)
+        d_month = s1.selectbox("Month", ["(All)"] + months, key="dax_month")
+        d_region = s2.multiselect("Region", regions, default=regions, key="dax_region")
+        d_person = s3.selectbox("Person", ["(All)"] + sorted(people), key="dax_person")
+        slicers = {
+            ("Date", "Month"): None if d_month == "(All)" else [d_month],
+            ("Sales", "Region"): None if set(d_region) == set(regions) else d_region,
+            ("Sales", "Person"): None if d_person == "(All)" else [d_person],
+        }
+        name, expression = split_definition(text)
+        measures = {name: expression} if name else {}
+        query = f"[{name}]" if name else expression
+        try:
+            started = perf_counter()
+            result = model.evaluate(query, slicers, measures)
+            by_month = model.evaluate(query, slicers, measures, by=("Date", "Month")) \
+                if not isinstance(result, pd.DataFrame) else None
+            elapsed = (perf_counter() - started) * 1000
+        except DaxError as e:
+            st.error(f"DAX error: {e}")
+        else:
+            if isinstance(result, pd.DataFrame):
+                st.dataframe(result, use_container_width=True, hide_index=True)
+            else:
+                label = name or "Result"
+                if result is None:
+                    st.metric(label, "(blank)")
+                elif isinstance(result, (int, float)):
+                    st.metric(label, f"{result:,.4f}" if abs(result) < 10 and result != int(result) else f"{result:,.0f}")
+                else:
+                    st.metric(label, str(result))
+                st.markdown("**By Month** (context transition over 'Date'[Month])")
+                st.bar_chart(by_month.set_index("Month")["Value"])
+            st.caption(f"Evaluated in {elapsed:.1f} ms — repeated measure/filter combinations come from the cache.")
+        if choice in PANDAS_EQUIVALENTS:
+            st.markdown("**pandas equivalent**")
+            st.code(PANDAS_EQUIVALENTS[choice], language="python")
+    with right:
+        st.subheader("Snippets")
+        for name, code in DAX_SNIPPETS:
+            st.markdown(f"**{name}**")
+            st.code(code, language="sql")
+
+# ----------------------------
+# CHARTS GALLERY Tab
+# ----------------------------
+@TABS.tab("Charts Gallery", state=["chart_"])
+def render_charts_gallery():
+    st.header("Charts Gallery")
+    f1, f2 = st.columns(2)
+    c_region = f1.multiselect("Region", regions, default=regions, key="chart_region")
+    c_person = f2.selectbox("Person", ["(All)"] + sorted(people), key="chart_person")
+    filters = {"Region": None if set(c_region) == set(regions) else c_region,
+               "Person": None if c_person == "(All)" else [c_person]}
+    names = list(CHARTS)
+    for row in range(0, len(names), 2):
+        for col, name in zip(st.columns(2), names[row:row + 2]):
+            with col:
+                st.subheader(name)
+                payload = show_chart(name, sales_rows, DEFAULT_SEED, filters)
+                st.caption(f"{len(payload.frame):,} points from {payload.rows:,} rows · "
+                           f"{payload.data_bytes / 1024:.1f} KB data + {payload.spec_bytes / 1024:.1f} KB spec")
+
+# ----------------------------
+# DATASETS Tab
+# ----------------------------
+@TABS.tab("Datasets", state=["sales_export_", "hr_export_"])
+def render_datasets():
+    st.header("Sample Datasets")
+    st.subheader(f"Sales ({len(sales_df):,} rows)")
+    st.dataframe(sales_df.head(DISPLAY_ROWS), use_container_width=True, height=280)
+    export_download("Download sales", "sales", ("sales", sales_rows, DEFAULT_SEED),
+                    lambda: sales_df, len(sales_df), "sales_export")
+    st.subheader(f"HR ({len(hr_df):,} rows)")
+    st.dataframe(hr_df.head(DISPLAY_ROWS), use_container_width=True, height=280)
+    export_download("Download HR", "hr", ("hr", DEFAULT_HR_ROWS, DEFAULT_SEED),
+                    lambda: hr_df, len(hr_df), "hr_export")
+
+# ----------------------------
+# MINI PROJECTS Tab
+# ----------------------------
+@TABS.tab("Mini Projects", state=["hr_rows"])
+def render_mini_projects():
+    st.header("Mini Projects")
+    for title, desc in PROJECT_IDEAS:
+        st.markdown(f"<div class='card'><b>{title}</b><br>{desc}</div>", unsafe_allow_html=True)
+    render_hr_insights()
+
+def render_hr_insights():
+    """Live version of the "HR Attrition Insights" project (see hub/hr_analytics.py)."""
+    st.subheader("HR Attrition Insights")
+    hr_rows = st.selectbox("Employees", HR_ROW_OPTIONS, format_func=lambda n: f"{n:,}", key="hr_rows")
+    hr = load_hr_analytics(hr_rows, DEFAULT_SEED)
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Headcount", f"{len(hr):,}")
+    c2.metric("Hires (last 12 months)", f"{hr.hires_since(12):,}")
+    c3.metric("Median tenure", f"{hr.median_tenure():.1f} years")
+    c4.metric("High attrition risk", f"{hr.high_risk_share():.0%}")
+
+    left, right = st.columns(2)
+    with left:
+        st.markdown("**Headcount by department** (month end)")
+        show_payload(hr_chart("Headcount", hr_rows, DEFAULT_SEED))
+    with right:
+        st.markdown("**Tenure distribution**")
+        show_payload(hr_chart("Tenure", hr_rows, DEFAULT_SEED))
+
+    st.markdown("**Salary bands (Dept × Level)**")
+    st.dataframe(hr.salary_bands(), use_container_width=True, hide_index=True)
+
+    left, right = st.columns([0.45, 0.55])
+    with left:
+        st.markdown("**Attrition risk by department**")
+        st.dataframe(hr.risk_summary(), use_container_width=True, hide_index=True)
+    with right:
+        st.markdown("**Highest-risk employees**")
+        st.dataframe(hr.top_risk(10), use_container_width=True, hide_index=True)
+    weights = ", ".join(f"{name} {w:.0%}" for name, w in RISK_WEIGHTS.items())
+    st.caption(f"Risk score (0–100) = weighted blend of {weights}. Performance: C = 1, B = 0.4, A = 0; "
+               f"Pay: below the Dept × Level median scores higher; Tenure halves every {TENURE_HALF_LIFE:g} years. "
+               "The sample has no exit dates, so headcount counts every hire to date.")
+
+# ----------------------------
+# QUIZ Tab
+# ----------------------------
+QUIZ_LENGTH = 10
+
+@TABS.tab("Quiz", state=["quiz_"])
+def render_quiz():
+    st.header("Quiz")
+    counts = ", ".join(f"{t}: {n}" for t, n in QUIZ_BANK.topic_counts().items())
+    st.caption(f"{len(QUIZ_BANK)} questions in the bank ({counts}). Pass mark: {PASS_MARK:.0%}.")
+    if "quiz_seed" not in st.session_state:
+        st.session_state.quiz_seed = 0
+    seed = st.session_state.quiz_seed
+    picked = QUIZ_BANK.sample(QUIZ_LENGTH, seed)
+    with st.form("quiz_form"):
+        chosen = []
+        for n, qi in enumerate(picked, start=1):
+            q = QUIZ_BANK[qi]
+            chosen.append(st.radio(f"{n}. {q.question}", range(len(q.options)), index=None,
+                                   format_func=lambda i, opts=q.options: opts[i], key=f"quiz_{seed}_{qi}"))
+        submitted = st.form_submit_button("Submit answers")
+    if submitted:
+        score, topic_scores, correct = grade_sheet(QUIZ_BANK, picked, chosen)
+        st.session_state.quiz_scores = {"score": score, "topics": topic_scores}
+        st.session_state.passed_quiz = st.session_state.passed_quiz or score >= PASS_MARK
+        st.metric("Score", f"{score:.0%}")
+        (st.success if score >= PASS_MARK else st.warning)(
+            "Passed — your certificate is unlocked!" if score >= PASS_MARK else "Not quite — try a new quiz.")
+        st.dataframe(pd.DataFrame({"Topic": list(topic_scores), "Accuracy": list(topic_scores.values())}),
+                     use_container_width=True, hide_index=True)
+        for qi, ok in zip(picked, correct):
+            if not ok:
+                q = QUIZ_BANK[qi]
+                with st.expander(f"✗ {q.question}"):
+                    st.markdown(f"**Answer:** {q.options[q.correct_index]}")
+                    if q.explanation:
+                        st.caption(q.explanation)
+    if st.button("New quiz"):
+        st.session_state.quiz_seed += 1
+        st.rerun(scope="fragment")
+
+    st.markdown("<div class='divider'></div>", unsafe_allow_html=True)
+    st.subheader("Cohort grading")
+    st.caption("Upload one row per learner: a `learner` column plus `Q<n>` columns "
+               "(n = question number in the bank) holding the chosen option letter.")
+    make_download_button("Download answer-sheet template", answer_sheet_template(range(len(QUIZ_BANK))),
+                         "answer_sheet_template.csv", "text/csv")
+    upload = st.file_uploader("Answer sheets (CSV)", type=["csv"], key="cohort_csv", help=UPLOAD_RESET_HELP)
+    if upload is not None:
+        try:
+            report = grade_answer_csv(upload.getvalue())
+        except ValueError as e:
+            st.error(str(e))
+            return
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Learners", f"{len(report.learners):,}")
+        c2.metric("Pass rate", f"{report.learners['Passed'].mean():.0%}")
+        c3.metric("Mean score", f"{report.learners['Score'].mean():.0%}")
+        st.markdown("#### Accuracy by topic")
+        st.dataframe(report.topics, use_container_width=True, hide_index=True)
+        st.markdown("#### Item analysis (lowest discrimination first)")
+        st.dataframe(report.items.sort_values("Discrimination"), use_container_width=True, hide_index=True)
+        st.markdown("#### Learners")
+        st.dataframe(report.learners.head(DISPLAY_ROWS), use_container_width=True)
+
+# ----------------------------
+# SHORTCUTS Tab
+# ----------------------------
+@TABS.tab("Shortcuts")
+def render_shortcuts():
+    st.header("Keyboard Shortcuts")
+    for app_name, keys in SHORTCUTS:
+        st.subheader(app_name)
+        st.table(pd.DataFrame(keys, columns=["Keys", "Action"]))
+
+# ----------------------------
+# CHEAT SHEETS Tab
+# ----------------------------
+@TABS.tab("Cheat Sheets")
+def render_cheat_sheets():
+    st.header("Cheat Sheets")
+    sheet = "\n".join(["EXCEL TIPS"] + [f"- {t}" for t in EXCEL_TIPS]
+                      + ["", "POWER BI TIPS"] + [f"- {t}" for t in POWERBI_TIPS]
+                      + ["", "DAX"] + [f"{n}: {c}" for n, c in DAX_SNIPPETS])
+    st.code(sheet, language="text")
+    make_download_button("Download cheat sheet", sheet.encode("utf-8"), "cheat_sheet.txt", "text/plain")
+
+# ----------------------------
+# CERTIFICATE Tab
+# ----------------------------
+@TABS.tab("Certificate", state=["cert_", "roster_fmt"])
+def render_certificate_tab():
+    from hub import certificate  # Pillow is imported on first use of this tab
+
+    st.header("Certificate")
+    accent = st.session_state.accent
+    if not st.session_state.passed_quiz:
+        st.info("Pass the quiz to unlock your certificate.")
+    else:
+        name = st.text_input("Name on certificate", value=st.session_state.username, key="cert_name")
+        score = st.session_state.quiz_scores.get("score", PASS_MARK)
+        img = certificate.render_certificate(name, score, date.today(), accent)
+        st.image(img, use_container_width=True)
+        fmt = st.radio("Format", list(certificate.FORMATS), horizontal=True, key="cert_fmt")
+        ext, mime = certificate.FORMATS[fmt]
+        make_download_button(f"Download certificate ({fmt})", lambda: certificate.encode(img, fmt),
+                             f"certificate.{ext}", mime)
+
+    with st.expander("Instructor: bulk certificates"):
+        st.caption("CSV with `name` and `score` (0-1 or 0-100) columns and an optional `date` column.")
+        upload = st.file_uploader("Roster (CSV)", type=["csv"], key="roster_csv", help=UPLOAD_RESET_HELP)
+        if upload is not None:
+            try:
+                roster = certificate.read_roster(upload)
+            except ValueError as e:
+                st.error(str(e))
+                return
+            bulk_fmt = st.radio("Format", list(certificate.FORMATS), horizontal=True, key="roster_fmt")
+            make_download_button(f"Download {len(roster):,} certificates (ZIP)",
+                                 lambda: certificate.roster_zip(roster, accent, bulk_fmt),
+                                 "certificates.zip", "application/zip")
+
+TABS.render()
+
+# Opened with ?admin=1; rendered last so this run's cache calls are counted.
+if admin_enabled():
+    with section("Admin panel"):
+        render_admin_panel()
+
+if profile is not None and panel_enabled():
+    render_performance_panel(profile)
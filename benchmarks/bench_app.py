@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Rerun benchmark for App.py: per-section wall time and allocations.
+
+Drives the script headlessly with Streamlit's AppTest at several sales
+dataset sizes, visits every tab and records the sections timed by
+hub/profiling.py.  Wall times come from runs without tracemalloc;
+allocations come from a separate traced pass, so tracing overhead never
+inflates the timings.  Writes a JSON report and exits non-zero when a
+section regressed against the baseline.  Whole-run totals are reported
+but not gated: most of their time is AppTest's own overhead, which is
+noisy.
+
+Absolute timings only compare on the same hardware, so each machine has
+its own baseline, ``benchmarks/baselines/<machine id>.json``; a machine
+without one just reports.  Record or refresh a baseline in a commit of
+its own, never alongside the change being measured.
+
+Run from the repository root:
+    python -m benchmarks.bench_app --rows 120 100000 --report bench_app.json
+    python -m benchmarks.bench_app --update-baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List, Optional
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from hub.datasets import SALES_ROW_OPTIONS
+from hub.profiling import PROFILE_ENV, PROFILE_KEY
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = ROOT / "App.py"
+BASELINES = Path(__file__).resolve().parent / "baselines"
+RUN = "Run"  # whole AppTest run, measured outside the script; "Run: <tab>" on warm runs
+
+# sizes fast enough for a routine check; larger SALES_ROW_OPTIONS via --rows
+DEFAULT_ROWS = [n for n in SALES_ROW_OPTIONS if n <= 100_000]
+
+
+def machine_id() -> str:
+    """OS, architecture, CPU model and count, Python version: what absolute timings depend on."""
+    cpu = platform.processor()
+    try:
+        with open("/proc/cpuinfo") as fh:
+            cpu = next(line.split(":", 1)[1] for line in fh if line.startswith("model name"))
+    except (OSError, StopIteration):
+        pass
+    raw = f"{platform.system()}-{platform.machine()}-{cpu}-{os.cpu_count()}cpu-py{sys.version_info[0]}.{sys.version_info[1]}"
+    return re.sub(r"[^a-z0-9.]+", "-", raw.lower()).strip("-")
+
+
+def _run(at: AppTest, tab: Optional[str], timeout: float) -> Dict[str, dict]:
+    started = perf_counter()
+    if tab is None:
+        at.run(timeout=timeout)
+    else:
+        at.radio(key="active_tab").set_value(tab).run(timeout=timeout)
+    total = (perf_counter() - started) * 1000
+    if at.exception:
+        raise RuntimeError(f"{tab or 'first run'}: {at.exception[0].message}")
+    name = RUN if tab is None else f"{RUN}: {tab}"
+    sections = {name: {"section": name, "depth": 0, "ms": total, "alloc_kb": None, "peak_kb": None}}
+    sections.update((r["section"], r) for r in at.session_state[PROFILE_KEY].records())
+    return sections
+
+
+def _pass(rows: int, mode: str, repeat: int, timeout: float) -> Dict[str, List[Dict[str, dict]]]:
+    """Cold first run, then every tab ``repeat`` times on warm caches."""
+    os.environ[PROFILE_ENV] = mode
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    at = AppTest.from_file(str(APP), default_timeout=timeout)
+    at.session_state["sales_rows"] = rows
+    runs = {"cold": [_run(at, None, timeout)], "warm": []}
+    for tab in at.radio(key="active_tab").options:
+        for _ in range(repeat):
+            runs["warm"].append(_run(at, tab, timeout))
+    return runs
+
+
+def _summarise(timed: List[Dict[str, dict]], traced: List[Dict[str, dict]]) -> Dict[str, dict]:
+    """Median and best ms from the timed runs and max KB from the traced runs, per section."""
+    out: Dict[str, dict] = {}
+    for name in dict.fromkeys(n for run in timed for n in run):
+        ms = [run[name]["ms"] for run in timed if name in run]
+        entry = {"ms": round(statistics.median(ms), 2), "best_ms": round(min(ms), 2)}
+        for field in ("alloc_kb", "peak_kb"):
+            kb = [run[name][field] for run in traced if name in run and run[name][field] is not None]
+            if kb:
+                entry[field] = round(max(kb), 1)
+        out[name] = entry
+    return out
+
+
+def measure(rows: List[int], repeat: int, timeout: float) -> dict:
+    report = {"meta": {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(), "platform": platform.platform(),
+        "cpus": os.cpu_count(), "machine": machine_id(), "streamlit": st.__version__, "repeat": repeat,
+    }, "sizes": {}}
+    previous = os.environ.get(PROFILE_ENV)
+    try:
+        for n in rows:
+            print(f"rows={n:,}: timing...", file=sys.stderr)
+            timed = _pass(n, "1", repeat, timeout)
+            print(f"rows={n:,}: tracing allocations...", file=sys.stderr)
+            traced = _pass(n, "memory", 1, timeout)
+            report["sizes"][str(n)] = {phase: _summarise(timed[phase], traced[phase]) for phase in ("cold", "warm")}
+    finally:
+        if previous is None:
+            os.environ.pop(PROFILE_ENV, None)
+        else:
+            os.environ[PROFILE_ENV] = previous
+    return report
+
+
+def regressions(report: dict, baseline: dict, tolerance: float, min_ms: float, min_kb: float) -> List[str]:
+    """Sections slower (or hungrier) than baseline by more than ``tolerance`` and the absolute floor."""
+    found = []
+    for size, phases in report["sizes"].items():
+        for phase, sections in phases.items():
+            base_sections = baseline.get("sizes", {}).get(size, {}).get(phase, {})
+            for name, now in sections.items():
+                base = base_sections.get(name)
+                if base is None or name.startswith(RUN):
+                    continue
+                # best-of-N time: transient load on the machine only ever adds time
+                for field, floor in (("best_ms", min_ms), ("peak_kb", min_kb)):
+                    if field in now and field in base and now[field] > base[field] * (1 + tolerance) \
+                            and now[field] - base[field] > floor:
+                        found.append(f"rows={size} {phase:<4} {name:<28} {field:<7} "
+                                     f"{base[field]:>10,.1f} -> {now[field]:>10,.1f}")
+    return found
+
+
+def print_report(report: dict) -> None:
+    for size, phases in report["sizes"].items():
+        print(f"\nrows={int(size):,}")
+        for phase, sections in phases.items():
+            print(f"  {phase}")
+            for name, s in sections.items():
+                peak = f"{s['peak_kb']:>10,.0f} KB peak" if "peak_kb" in s else ""
+                print(f"    {name:<28} {s['ms']:>9,.1f} ms {peak}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="sales dataset sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="warm reruns per tab (median and best are kept)")
+    parser.add_argument("--timeout", type=float, default=600, help="seconds allowed per script run")
+    parser.add_argument("--report", type=Path, default=ROOT / "bench_app.json", help="JSON report path")
+    parser.add_argument("--baseline", type=Path, default=BASELINES / f"{machine_id()}.json",
+                        help="defaults to this machine's file in benchmarks/baselines/")
+    parser.add_argument("--update-baseline", action="store_true", help="store this report as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed relative slowdown")
+    parser.add_argument("--min-ms", type=float, default=25, help="ignore slowdowns smaller than this")
+    parser.add_argument("--min-kb", type=float, default=1024, help="ignore peak growth smaller than this")
+    args = parser.parse_args()
+
+    report = measure(args.rows, args.repeat, args.timeout)
+    print_report(report)
+    args.report.write_text(json.dumps(report, indent=2))
+    print(f"\nreport: {args.report}")
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"baseline updated: {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"no baseline for this machine ({args.baseline.name}); "
+              "run with --update-baseline and commit it on its own")
+        return
+    found = regressions(report, json.loads(args.baseline.read_text()),
+                        args.tolerance, args.min_ms, args.min_kb)
+    if found:
+        print(f"\n{len(found)} regression(s) against {args.baseline.name}:")
+        print("\n".join(found))
+        sys.exit(1)
+    print(f"no regressions against {args.baseline.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+Certificates-per-second benchmark for hub/certificate.py.
+
+Run from the repository root:
+    python -m benchmarks.bench_certificates --n 500 --format PNG --workers 4
+"""
+
+import argparse
+import os
+import time
+
+from hub import certificate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n", type=int, default=200, help="learners in the synthetic roster")
+    parser.add_argument("--format", choices=list(certificate.FORMATS), default="PNG")
+    parser.add_argument("--workers", type=int, default=min(os.cpu_count() or 1, certificate.MAX_WORKERS))
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    certificate.template()
+    print(f"template build (once per accent): {time.perf_counter() - start:.3f} s")
+    for workers in sorted({1, args.workers}):
+        rate = certificate.benchmark(args.n, args.format, workers)
+        print(f"{args.format} x {args.n}, workers={workers}: {rate:,.1f} certificates/s")
+
+
+if __name__ == "__main__":
+    main()
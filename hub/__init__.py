@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+"""
+Support package for the Excel + Power BI Learning Hub.
+
+App.py stays the single page the learner sees; the heavier data and
+compute helpers it relies on live in the modules of this package.
+"""
+
+import importlib.util
+
+
+def has_module(name: str) -> bool:
+    """True when the optional dependency ``name`` is importable."""
+    return importlib.util.find_spec(name) is not None
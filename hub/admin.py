@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Admin panel: process memory, shared cache sizes and hit rates, sessions.
+
+Opened with ``?admin=1`` in the URL.  Session figures use Streamlit's
+private runtime API, which can change between releases, so every lookup is
+guarded and the panel degrades to "n/a" instead of failing the page.
+"""
+
+import os
+import resource
+import sys
+from typing import Dict, List, Optional
+
+import pandas as pd
+import streamlit as st
+
+from hub.cache import cache_table, nbytes, shared_objects
+
+ADMIN_QUERY_PARAM = "admin"
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size (Linux), else the peak from getrusage."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _session_manager():
+    try:
+        from streamlit.runtime import Runtime
+
+        return Runtime.instance()._session_mgr
+    except Exception:  # no runtime (bare mode / tests) or private API changed
+        return None
+
+
+def active_sessions() -> Optional[int]:
+    mgr = _session_manager()
+    try:
+        return None if mgr is None else int(mgr.num_active_sessions())
+    except Exception:
+        return None
+
+
+def session_state_bytes(state) -> int:
+    """Memory held by one session's state (shared cached objects excluded)."""
+    seen = {id(v) for v in shared_objects()}
+    total = 0
+    for key in list(state.keys()):
+        try:
+            total += nbytes(state[key], seen)
+        except Exception:  # widget values that are not readable outside a run
+            continue
+    return total
+
+
+def session_table() -> pd.DataFrame:
+    """Per-session state size for every active session (needs the private runtime API)."""
+    mgr = _session_manager()
+    rows: List[Dict] = []
+    try:
+        infos = [] if mgr is None else mgr.list_active_sessions()
+        for info in infos:
+            session = info.session
+            rows.append({"Session": str(session.id)[:8], "Reruns": info.script_run_count,
+                         "State keys": len(session.session_state.filtered_state),
+                         "State (KB)": round(session_state_bytes(session.session_state.filtered_state) / 1024, 1)})
+    except Exception:
+        rows = []
+    return pd.DataFrame(rows, columns=["Session", "Reruns", "State keys", "State (KB)"])
+
+
+def admin_enabled() -> bool:
+    return st.query_params.get(ADMIN_QUERY_PARAM) == "1"
+
+
+def render_admin_panel() -> None:
+    with st.sidebar.expander("Admin", expanded=True):
+        rss = rss_bytes()
+        sessions = active_sessions()
+        c1, c2 = st.columns(2)
+        c1.metric("RSS", "n/a" if rss is None else f"{rss / 2**20:,.0f} MB")
+        c2.metric("Active sessions", "n/a" if sessions is None else f"{sessions}")
+        own = session_state_bytes(st.session_state.to_dict())
+        st.caption(f"This session: {len(st.session_state)} state keys, {own / 1024:.1f} KB")
+        caches = cache_table()
+        st.markdown("**Caches**")
+        st.dataframe(caches, use_container_width=True, hide_index=True)
+        live = caches["Size"] == "live"
+        st.caption(f"Shared cached objects: {caches.loc[live, 'Size (MB)'].sum():,.1f} MB "
+                   "(objects referenced by several caches are counted once). "
+                   f"Plus {caches.loc[~live, 'Size (MB)'].sum():,.1f} MB measured at build "
+                   "(bytes and pickled cache_data entries; dropped after their TTL or max_entries).")
+        sessions_df = session_table()
+        if not sessions_df.empty:
+            st.markdown("**Sessions**")
+            st.dataframe(sessions_df, use_container_width=True, hide_index=True)
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+Instrumented wrappers around Streamlit's caches, for the admin panel.
+
+``cache_resource`` / ``cache_data`` behave like the ``st.`` decorators but
+also count calls and builds (cache misses) per loader and keep a weak
+reference to each built object, so its memory can be measured later
+without keeping it alive.
+
+Entries are keyed by the hashed arguments, as Streamlit keys them
+(parameters starting with ``_`` are skipped).  Values that cannot be
+weakly referenced (bytes, and every ``cache_data`` entry, which the cache
+holds pickled) are tracked by their size at build; they are dropped once
+past the cache's ``ttl`` or beyond ``max_entries`` (oldest first), which
+mirrors but cannot observe Streamlit's own eviction.
+"""
+
+import functools
+import hashlib
+import inspect
+import reprlib
+import sys
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Callable, Dict, NamedTuple, Optional, Set
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.time_util import time_to_seconds
+
+
+class CacheEntry(NamedTuple):
+    args: str                      # short, readable argument summary
+    ref: Optional[weakref.ref]     # built value, if it can be weakly referenced
+    size: int                      # bytes when built
+    built: float                   # time.monotonic() at build
+
+
+@dataclass
+class CacheStats:
+    name: str
+    kind: str                      # "resource" (shared object) or "data" (copied per call)
+    ttl: float = float("inf")      # seconds, as passed to the st. decorator
+    max_entries: Optional[int] = None
+    calls: int = 0
+    builds: int = 0
+    build_seconds: float = 0.0
+    # digest of the hashed arguments -> entry
+    entries: Dict[str, CacheEntry] = field(default_factory=dict)
+
+    @property
+    def hits(self) -> int:
+        return max(self.calls - self.builds, 0)
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        return self.hits / self.calls if self.calls else None
+
+    def live_entries(self) -> Dict[str, CacheEntry]:
+        """Entries still cached: collected values, expired and overflowing entries are dropped."""
+        now = time.monotonic()
+        with _LOCK:
+            for key, e in list(self.entries.items()):
+                if (e.ref is not None and e.ref() is None) or now - e.built > self.ttl:
+                    del self.entries[key]
+            if self.max_entries is not None:
+                for key in list(self.entries)[:max(len(self.entries) - self.max_entries, 0)]:
+                    del self.entries[key]  # oldest builds first
+            return dict(self.entries)
+
+
+STATS: Dict[str, CacheStats] = {}
+_LOCK = threading.Lock()
+
+
+def nbytes(obj, seen: Optional[Set[int]] = None, depth: int = 0) -> int:
+    """Approximate memory of ``obj``; objects already in ``seen`` count once."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen or depth > 4:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, (bytes, bytearray, str)):
+        return sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(nbytes(k, seen, depth + 1) + nbytes(v, seen, depth + 1)
+                                        for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(nbytes(v, seen, depth + 1) for v in obj)
+    attrs = getattr(obj, "__dict__", None)
+    if attrs is None and hasattr(obj, "__slots__"):
+        attrs = {s: getattr(obj, s) for s in obj.__slots__ if hasattr(obj, s)}
+    if attrs is not None:
+        return sys.getsizeof(obj) + sum(nbytes(v, seen, depth + 1) for v in attrs.values())
+    return sys.getsizeof(obj)
+
+
+_short = reprlib.Repr()
+_short.maxstring, _short.maxother, _short.maxtuple, _short.maxlist = 40, 40, 8, 8
+
+
+def _hashed_args(signature: inspect.Signature, args: tuple, kwargs: dict) -> Dict[str, object]:
+    """Arguments Streamlit hashes for the cache key (names starting with ``_`` are skipped)."""
+    try:
+        bound = signature.bind(*args, **kwargs)
+    except TypeError:
+        return {str(i): a for i, a in enumerate(args)} | kwargs
+    bound.apply_defaults()
+    return {k: v for k, v in bound.arguments.items() if not k.startswith("_")}
+
+
+def _describe(hashed: Dict[str, object]) -> str:
+    return ", ".join(f"{k}={_short.repr(v)}" for k, v in hashed.items())
+
+
+def _digest(hashed: Dict[str, object]) -> str:
+    return hashlib.sha1(repr(sorted(hashed.items())).encode()).hexdigest()
+
+
+def _weak(value) -> Optional[weakref.ref]:
+    try:
+        return weakref.ref(value)
+    except TypeError:  # e.g. bytes, tuples
+        return None
+
+
+def _instrumented(decorator: Callable, kind: str, name: str, **kwargs) -> Callable:
+    def wrap(func: Callable) -> Callable:
+        stats = STATS.setdefault(name, CacheStats(name, kind, time_to_seconds(kwargs.get("ttl")),
+                                                  kwargs.get("max_entries")))
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def build(*args, **kw):
+            started = perf_counter()
+            value = func(*args, **kw)
+            size = nbytes(value)
+            hashed = _hashed_args(signature, args, kw)
+            entry = CacheEntry(_describe(hashed), _weak(value) if kind == "resource" else None,
+                               size, time.monotonic())
+            key = _digest(hashed)
+            with _LOCK:
+                stats.builds += 1
+                stats.build_seconds += perf_counter() - started
+                stats.entries.pop(key, None)  # a rebuild moves to the newest position
+                stats.entries[key] = entry
+            return value
+
+        cached = decorator(**kwargs)(build)
+
+        @functools.wraps(func)
+        def call(*args, **kw):
+            with _LOCK:
+                stats.calls += 1
+            return cached(*args, **kw)
+
+        call.clear = cached.clear
+        return call
+    return wrap
+
+
+def cache_resource(name: str, **kwargs) -> Callable:
+    """``st.cache_resource`` (one shared object per key) with hit/miss counters."""
+    return _instrumented(st.cache_resource, "resource", name, **kwargs)
+
+
+def cache_data(name: str, **kwargs) -> Callable:
+    """``st.cache_data`` (pickled copy per call) with hit/miss counters."""
+    return _instrumented(st.cache_data, "data", name, **kwargs)
+
+
+def shared_objects() -> list:
+    """Cached values that are still alive and shared (weakly referenced entries)."""
+    with _LOCK:
+        stats = list(STATS.values())
+    values = (e.ref() for s in stats for e in s.live_entries().values() if e.ref is not None)
+    return [v for v in values if v is not None]
+
+
+def cache_table() -> pd.DataFrame:
+    """One row per cache entry; shared objects referenced by several caches count once.
+
+    "Size" is ``live`` when measured now on the shared object, ``at build``
+    for values only known by their size when they were built.
+    """
+    seen: Set[int] = set()
+    rows = []
+    with _LOCK:
+        stats = list(STATS.values())
+    for s in stats:
+        for e in s.live_entries().values():
+            value = e.ref() if e.ref is not None else None
+            rows.append({
+                "Cache": s.name, "Kind": s.kind, "Args": e.args,
+                "Size (MB)": round((e.size if value is None else nbytes(value, seen)) / 2**20, 2),
+                "Size": "at build" if value is None else "live",
+                "Calls": s.calls, "Hit rate": None if s.hit_rate is None else round(s.hit_rate, 3),
+                "Build (s)": round(s.build_seconds, 3),
+            })
+    return pd.DataFrame(rows, columns=["Cache", "Kind", "Args", "Size (MB)", "Size", "Calls", "Hit rate",
+                                       "Build (s)"])
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+Certificate rendering.
+
+The static part of a certificate (gradient background, borders, title and
+captions) is rendered once per accent colour and cached; fonts are cached
+per size.  Each learner only costs a copy of the template plus drawing the
+name / score / date text.  Rosters are written into a ZIP archive, one PNG
+or PDF per learner.  Large rosters are rendered on a small process pool;
+each worker is a fresh interpreter that imports NumPy, pandas and Pillow,
+so short rosters (and single-CPU hosts) render in-process instead.
+"""
+
+import io
+import os
+import re
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import lru_cache
+from multiprocessing import get_context
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from PIL import Image, ImageDraw, ImageFont
+
+SIZE = (1600, 1131)  # A4 landscape at ~137 dpi
+BACKGROUND = ("#071018", "#081020")
+TEXT = "#e8eef8"
+MUTED = "#9fb3c8"
+ISSUER = "Excel + Power BI Learning Hub"
+FONT_FILES = ("DejaVuSans.ttf", "Arial.ttf", "LiberationSans-Regular.ttf")
+BOLD_FONT_FILES = ("DejaVuSans-Bold.ttf", "Arial Bold.ttf", "LiberationSans-Bold.ttf")
+FORMATS = {"PNG": ("png", "image/png"), "PDF": ("pdf", "application/pdf")}
+POOL_MIN_LEARNERS = 200  # below this, worker start-up costs more than it saves
+MAX_WORKERS = 4          # the pool shares the server's CPUs with every session
+
+# A roster row: (name, score 0..1, issue date)
+Learner = Tuple[str, float, date]
+
+
+# ----------------------------
+# Cached static layers
+# ----------------------------
+@lru_cache(maxsize=32)
+def get_font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
+    for path in (BOLD_FONT_FILES if bold else FONT_FILES):
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError:
+            continue
+    return ImageFont.load_default(size=size)
+
+
+def _hex_rgb(color: str) -> np.ndarray:
+    color = color.lstrip("#")
+    return np.array([int(color[i:i + 2], 16) for i in (0, 2, 4)], dtype=np.float32)
+
+
+def _centered(draw: ImageDraw.ImageDraw, y: int, text: str, font, fill: str) -> None:
+    draw.text((SIZE[0] // 2, y), text, font=font, fill=fill, anchor="mm")
+
+
+@lru_cache(maxsize=16)
+def template(accent: str = "#8A2BE2") -> Image.Image:
+    """Background, frame, title and captions — everything except learner text."""
+    w, h = SIZE
+    t = np.linspace(0.0, 1.0, w * h, dtype=np.float32).reshape(h, w, 1)
+    start, end = _hex_rgb(BACKGROUND[0]), _hex_rgb(BACKGROUND[1])
+    img = Image.fromarray((start + (end - start) * t).astype(np.uint8), "RGB")
+    draw = ImageDraw.Draw(img)
+    draw.rectangle([30, 30, w - 30, h - 30], outline=accent, width=10)
+    draw.rectangle([60, 60, w - 60, h - 60], outline=MUTED, width=2)
+    _centered(draw, 210, "CERTIFICATE OF ACHIEVEMENT", get_font(72, bold=True), accent)
+    _centered(draw, 330, "This certifies that", get_font(34), MUTED)
+    draw.line([w // 2 - 420, 520, w // 2 + 420, 520], fill=accent, width=3)
+    _centered(draw, 600, f"has successfully completed the {ISSUER}", get_font(34), TEXT)
+    _centered(draw, 650, "Excel · Power Query · Power BI · DAX", get_font(28), MUTED)
+    draw.line([200, 930, 620, 930], fill=MUTED, width=2)
+    draw.line([w - 620, 930, w - 200, 930], fill=MUTED, width=2)
+    draw.text((410, 965), "Date", font=get_font(26), fill=MUTED, anchor="mm")
+    draw.text((w - 410, 965), "Quiz score", font=get_font(26), fill=MUTED, anchor="mm")
+    return img
+
+
+# ----------------------------
+# Per-learner rendering
+# ----------------------------
+def render_certificate(name: str, score: float, issued: date, accent: str = "#8A2BE2") -> Image.Image:
+    img = template(accent).copy()
+    draw = ImageDraw.Draw(img)
+    _centered(draw, 450, name, get_font(88, bold=True), TEXT)
+    draw.text((410, 895), issued.strftime("%d %b %Y"), font=get_font(36), fill=TEXT, anchor="mm")
+    draw.text((SIZE[0] - 410, 895), f"{score:.0%}", font=get_font(36), fill=TEXT, anchor="mm")
+    return img
+
+
+def encode(img: Image.Image, fmt: str = "PNG") -> bytes:
+    buf = io.BytesIO()
+    if fmt == "PDF":
+        img.save(buf, format="PDF", resolution=137.0)
+    else:
+        img.save(buf, format="PNG", compress_level=1)
+    return buf.getvalue()
+
+
+def file_stem(name: str, i: int) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_") or "learner"
+    return f"{i:05d}_{slug}"
+
+
+def _render_job(job: Tuple[int, Learner, str, str]) -> Tuple[str, bytes]:
+    i, (name, score, issued), accent, fmt = job
+    data = encode(render_certificate(name, score, issued, accent), fmt)
+    return f"{file_stem(name, i)}.{FORMATS[fmt][0]}", data
+
+
+def _warm(accent: str) -> None:
+    template(accent)
+
+
+# ----------------------------
+# Batch rendering
+# ----------------------------
+def read_roster(source, default_date: Optional[date] = None) -> List[Learner]:
+    """Roster CSV with ``name`` and ``score`` (0-1 or 0-100) and optional ``date`` columns."""
+    df = pd.read_csv(source)
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    if "name" not in df.columns or "score" not in df.columns:
+        raise ValueError("Roster needs 'name' and 'score' columns.")
+    score = pd.to_numeric(df["score"], errors="coerce").fillna(0.0)
+    score = np.where(score > 1, score / 100.0, score)
+    default_date = default_date or date.today()
+    dates = pd.to_datetime(df["date"], errors="coerce") if "date" in df.columns else pd.Series(pd.NaT, index=df.index)
+    return [(str(n), float(s), d.date() if not pd.isna(d) else default_date)
+            for n, s, d in zip(df["name"], score, dates)]
+
+
+def default_workers(n_learners: int) -> int:
+    """1 (in-process) for short rosters, else one per CPU up to ``MAX_WORKERS``."""
+    if n_learners < POOL_MIN_LEARNERS:
+        return 1
+    return max(1, min(os.cpu_count() or 1, MAX_WORKERS))
+
+
+def render_roster(roster: Iterable[Learner], accent: str = "#8A2BE2", fmt: str = "PNG",
+                  workers: Optional[int] = None) -> Iterator[Tuple[str, bytes]]:
+    """Yield ``(file name, bytes)`` per learner, in roster order."""
+    roster = list(roster)
+    jobs = ((i, learner, accent, fmt) for i, learner in enumerate(roster, start=1))
+    workers = workers if workers is not None else default_workers(len(roster))
+    if workers <= 1:
+        yield from map(_render_job, jobs)
+        return
+    # spawn: the Streamlit server is multi-threaded, so forking it is not safe.
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"),
+                             initializer=_warm, initargs=(accent,)) as pool:
+        yield from pool.map(_render_job, jobs, chunksize=8)
+
+
+def roster_zip(roster: Iterable[Learner], accent: str = "#8A2BE2", fmt: str = "PNG",
+               workers: Optional[int] = None) -> bytes:
+    """ZIP of every certificate, as bytes for ``st.download_button``."""
+    out = io.BytesIO()
+    # PNG/PDF payloads are already compressed; storing them avoids a second pass.
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_STORED) as zf:
+        for file_name, data in render_roster(roster, accent, fmt, workers):
+            zf.writestr(file_name, data)
+    return out.getvalue()
+
+
+def benchmark(n: int = 200, fmt: str = "PNG", workers: Optional[int] = None) -> float:
+    """Certificates per second for an ``n``-learner synthetic roster (ZIP included)."""
+    roster = [(f"Learner {i}", (i % 100) / 100, date(2025, 1, 1)) for i in range(n)]
+    template()  # exclude the one-off template build, as in a warm server
+    start = time.perf_counter()
+    roster_zip(roster, fmt=fmt, workers=workers)
+    return n / (time.perf_counter() - start)
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+Chart data layer for the Charts Gallery.
+
+Altair inlines every row of its DataFrame into the Vega-Lite spec, so a
+scaled dataset would ship megabytes of JSON per rerun.  Here the server
+reduces the rows first: roll-ups come from the sales cube, distributions
+are binned with NumPy, and long line series are downsampled with LTTB
+(Largest-Triangle-Three-Buckets).  Every chart payload has at most
+``MAX_POINTS`` rows, whatever the dataset size.
+
+The Altair spec is built without data and the reduced frame is passed
+separately to ``st.vega_lite_chart``, which ships it as an Arrow dataset
+referenced by the spec rather than inlined JSON.  Both are cached per
+(chart, dataset, filter).  Altair itself is imported only when a spec is
+first built, so it stays off the app's startup path.
+"""
+
+import json
+from typing import TYPE_CHECKING, Callable, Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from hub.cache import cache_data
+from hub.cube import load_sales_cube
+from hub.datasets import MONTHS, load_sales_df
+from hub.filters import load_sales_index
+
+if TYPE_CHECKING:
+    import altair as alt
+
+MAX_POINTS = 1000
+HIST_BINS = 40
+HEAT_BINS = 30
+
+# (column, allowed values or None) pairs, sorted: hashable for the cache
+FilterKey = Tuple[Tuple[str, Optional[Tuple[str, ...]]], ...]
+
+
+class ChartPayload(NamedTuple):
+    frame: pd.DataFrame   # reduced data, at most MAX_POINTS rows
+    spec: dict            # Vega-Lite spec without data
+    rows: int             # source rows represented by the payload
+
+    @property
+    def spec_bytes(self) -> int:
+        return len(json.dumps(self.spec))
+
+    @property
+    def data_bytes(self) -> int:
+        return int(self.frame.memory_usage(index=False, deep=True).sum())
+
+
+def filter_key(filters: Dict[str, Optional[list]]) -> FilterKey:
+    return tuple(sorted((col, None if v is None else tuple(sorted(map(str, v)))) for col, v in filters.items()))
+
+
+# ----------------------------
+# Reductions
+# ----------------------------
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of ``n_out`` points chosen by Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last point; each interior bucket contributes the
+    point forming the largest triangle with the previously kept point and
+    the mean of the next bucket, which preserves peaks and troughs.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)  # n_out - 2 interior buckets
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+def histogram(values: np.ndarray, bins: int = HIST_BINS) -> pd.DataFrame:
+    counts, edges = np.histogram(values, bins=bins)
+    return pd.DataFrame({"start": edges[:-1], "end": edges[1:], "count": counts})
+
+
+def histogram2d(x: np.ndarray, y: np.ndarray, bins: int = HEAT_BINS) -> pd.DataFrame:
+    counts, xe, ye = np.histogram2d(x, y, bins=bins)
+    xi, yi = np.nonzero(counts)  # empty cells are not sent
+    return pd.DataFrame({"x0": xe[xi], "x1": xe[xi + 1], "y0": ye[yi], "y1": ye[yi + 1],
+                         "count": counts[xi, yi].astype(np.int64)})
+
+
+def cap_points(payload: ChartPayload, max_points: int = MAX_POINTS) -> ChartPayload:
+    """Safety net for the ``MAX_POINTS`` guarantee: evenly thin a frame that a reducer left too long."""
+    n = len(payload.frame)
+    if n <= max_points:
+        return payload
+    keep = np.unique(np.linspace(0, n - 1, max_points).round().astype(np.int64))
+    return payload._replace(frame=payload.frame.iloc[keep].reset_index(drop=True))
+
+
+def vega_spec(chart: "alt.TopLevelMixin") -> dict:
+    """Vega-Lite spec of ``chart`` without inline data (the frame is sent separately)."""
+    spec = chart.properties(width="container").to_dict()
+    spec.pop("data", None)
+    spec.pop("datasets", None)
+    return spec
+
+
+# ----------------------------
+# Gallery charts
+# ----------------------------
+def revenue_by_month_region(n_rows: int, seed: int, where: Dict) -> ChartPayload:
+    import altair as alt
+
+    cube = load_sales_cube(n_rows, seed)
+    frame = cube.frame(["Month", "Region"], "Revenue")
+    for dim, values in where.items():
+        if values is not None and dim in ("Month", "Region"):
+            frame = frame[frame[dim].isin(values)]
+    if where.get("Person") is not None:  # the cube keeps Person, so re-slice per cell
+        frame = frame.assign(**{"Sum Revenue": [
+            cube.sum("Revenue", {"Month": m, "Region": r, "Person": where["Person"]})
+            for m, r in zip(frame["Month"], frame["Region"])]})
+    frame = frame[["Month", "Region", "Sum Revenue"]].astype({"Month": str, "Region": str})
+    chart = alt.Chart().mark_bar().encode(
+        x=alt.X("Month:N", sort=MONTHS), y=alt.Y("Sum Revenue:Q", title="Revenue"),
+        color="Region:N", tooltip=["Month:N", "Region:N", alt.Tooltip("Sum Revenue:Q", format=",")])
+    return ChartPayload(frame.reset_index(drop=True), vega_spec(chart), cube.count(where))
+
+
+def _rows(n_rows: int, seed: int, where: Dict, columns) -> Tuple[np.ndarray, ...]:
+    df = load_sales_df(n_rows, seed)
+    pos = load_sales_index(n_rows, seed).positions(where)
+    return tuple(df[c].to_numpy() if pos is None else df[c].to_numpy()[pos] for c in columns)
+
+
+def units_histogram(n_rows: int, seed: int, where: Dict) -> ChartPayload:
+    import altair as alt
+
+    (units,) = _rows(n_rows, seed, where, ["Units"])
+    chart = alt.Chart().mark_bar().encode(
+        x=alt.X("start:Q", bin="binned", title="Units"), x2="end:Q", y=alt.Y("count:Q", title="Rows"),
+        tooltip=[alt.Tooltip("start:Q", format=".0f"), alt.Tooltip("end:Q", format=".0f"), "count:Q"])
+    return ChartPayload(histogram(units), vega_spec(chart), len(units))
+
+
+def units_revenue_heatmap(n_rows: int, seed: int, where: Dict) -> ChartPayload:
+    import altair as alt
+
+    units, revenue = _rows(n_rows, seed, where, ["Units", "Revenue"])
+    chart = alt.Chart().mark_rect().encode(
+        x=alt.X("x0:Q", bin="binned", title="Units"), x2="x1:Q",
+        y=alt.Y("y0:Q", bin="binned", title="Revenue"), y2="y1:Q",
+        color=alt.Color("count:Q", title="Rows"), tooltip=["count:Q"])
+    return ChartPayload(histogram2d(units, revenue), vega_spec(chart), len(units))
+
+
+def running_revenue(n_rows: int, seed: int, where: Dict) -> ChartPayload:
+    import altair as alt
+
+    (revenue,) = _rows(n_rows, seed, where, ["Revenue"])
+    total = np.cumsum(revenue, dtype=np.int64)
+    row = np.arange(1, len(total) + 1)
+    keep = lttb(row, total, MAX_POINTS)
+    frame = pd.DataFrame({"Transaction": row[keep], "Running Revenue": total[keep]})
+    chart = alt.Chart().mark_line().encode(
+        x=alt.X("Transaction:Q"), y=alt.Y("Running Revenue:Q"),
+        tooltip=[alt.Tooltip("Transaction:Q", format=","), alt.Tooltip("Running Revenue:Q", format=",")])
+    return ChartPayload(frame, vega_spec(chart), len(total))
+
+
+CHARTS: Dict[str, Callable[[int, int, Dict], ChartPayload]] = {
+    "Revenue by Month & Region": revenue_by_month_region,
+    "Units Distribution": units_histogram,
+    "Units vs Revenue Density": units_revenue_heatmap,
+    "Running Revenue (LTTB)": running_revenue,
+}
+
+
+@cache_data("Chart payloads", max_entries=64, show_spinner=False)
+def chart_payload(chart: str, n_rows: int, seed: int, filters: FilterKey) -> ChartPayload:
+    """Reduced data + spec for one chart, cached per (chart, dataset, filter)."""
+    return cap_points(CHARTS[chart](n_rows, seed, {col: None if v is None else list(v) for col, v in filters}))
+
+
+def show_payload(payload: ChartPayload) -> ChartPayload:
+    st.vega_lite_chart(payload.frame, payload.spec, use_container_width=True)
+    return payload
+
+
+def show_chart(chart: str, n_rows: int, seed: int, filters: Dict[str, Optional[list]]) -> ChartPayload:
+    return show_payload(chart_payload(chart, n_rows, seed, filter_key(filters)))
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Pre-aggregated cube of SUM/COUNT/AVG over every combination of a dataset's
+categorical dimensions.
+
+Cells live in dense NumPy arrays shaped ``(n_cat_1, n_cat_2, ...)``, so a
+point lookup is a single array read and a slice/roll-up only touches the
+(small) cube, never the underlying rows.
+"""
+
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from hub.cache import cache_resource
+from hub.datasets import load_sales_df
+
+Selection = Dict[str, Union[None, str, Iterable]]
+
+
+class Cube:
+    """Dense SUM and COUNT arrays for ``measures`` over the ``dims`` of ``df``."""
+
+    def __init__(self, df: pd.DataFrame, dims: Sequence[str], measures: Sequence[str]):
+        self.dims = list(dims)
+        self.categories: Dict[str, pd.Index] = {d: df[d].cat.categories for d in self.dims}
+        self.shape: Tuple[int, ...] = tuple(len(self.categories[d]) for d in self.dims)
+        codes = [df[d].cat.codes.to_numpy() for d in self.dims]
+        cell = np.ravel_multi_index(codes, self.shape) if len(df) else np.empty(0, dtype=np.intp)
+        size = int(np.prod(self.shape))
+        self.counts = np.bincount(cell, minlength=size).reshape(self.shape)
+        self.sums: Dict[str, np.ndarray] = {}
+        for m in measures:
+            values = df[m].to_numpy()
+            total = np.bincount(cell, weights=values, minlength=size).reshape(self.shape)
+            # bincount accumulates in float64, which is exact for integer totals below 2**53.
+            self.sums[m] = np.rint(total).astype(np.int64) if np.issubdtype(values.dtype, np.integer) else total
+
+    def _index(self, where: Optional[Selection]) -> Tuple:
+        where = where or {}
+        unknown = set(where) - set(self.dims)
+        if unknown:
+            raise KeyError(f"Not a cube dimension: {', '.join(sorted(unknown))}")
+        index = []
+        for d, n in zip(self.dims, self.shape):
+            values = where.get(d)
+            if values is None:
+                index.append(np.arange(n))
+                continue
+            if isinstance(values, str) or not isinstance(values, Iterable):
+                values = [values]
+            codes = self.categories[d].get_indexer(list(values))
+            index.append(codes[codes >= 0])
+        return np.ix_(*index)
+
+    def count(self, where: Optional[Selection] = None) -> int:
+        """Number of rows in the selected cells (``None`` values mean "all")."""
+        return int(self.counts[self._index(where)].sum())
+
+    def sum(self, measure: str, where: Optional[Selection] = None):
+        total = self.sums[measure][self._index(where)].sum()
+        return total.item()
+
+    def mean(self, measure: str, where: Optional[Selection] = None) -> float:
+        idx = self._index(where)
+        n = self.counts[idx].sum()
+        return float(self.sums[measure][idx].sum() / n) if n else float("nan")
+
+    def total(self, measure: str):
+        return self.sums[measure].sum().item()
+
+    def frame(self, by: Sequence[str], measure: str) -> pd.DataFrame:
+        """SUM/COUNT/AVG of ``measure`` rolled up to the ``by`` dimensions."""
+        drop = tuple(i for i, d in enumerate(self.dims) if d not in by)
+        sums = self.sums[measure].sum(axis=drop)
+        counts = self.counts.sum(axis=drop)
+        kept = [d for d in self.dims if d in by]
+        index = pd.MultiIndex.from_product([self.categories[d] for d in kept], names=kept)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avg = sums / counts
+        out = pd.DataFrame({f"Sum {measure}": sums.ravel(), "Count": counts.ravel(),
+                            f"Avg {measure}": avg.ravel()}, index=index)
+        return out.reset_index()
+
+
+SALES_CUBE_DIMS = ["Month", "Person", "Region"]
+SALES_CUBE_MEASURES = ["Units", "Revenue"]
+
+
+# Keyed on the dataset parameters, so the cube is rebuilt only when the data changes.
+@cache_resource("Sales cube", show_spinner="Aggregating sales cube...")
+def load_sales_cube(n_rows: int, seed: int) -> Cube:
+    return Cube(load_sales_df(n_rows, seed), SALES_CUBE_DIMS, SALES_CUBE_MEASURES)
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Sample datasets used by the labs (sales + HR).
+
+Every column is generated in one vectorized call from a seeded NumPy
+``Generator``, so the output depends only on ``(n_rows, seed)`` and the
+build time grows linearly with ``n_rows``.  Low-cardinality text columns are
+stored as pandas categoricals (one small code array per column).
+
+The frames are built directly on read-only NumPy arrays (``copy=False``), so
+the single copy shared by every session cannot be modified in place: any
+write raises instead of leaking into other users' views.  With pandas'
+copy-on-write, filtering and column selection give cheap views, and derived
+frames allocate only what they change.  Text columns are Arrow-backed
+strings.  Large frames are memory-mapped from an on-disk snapshot when one
+exists (see hub/snapshot.py), so a restarted server does not regenerate them.
+"""
+
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from hub.cache import cache_resource
+from hub.snapshot import SNAPSHOT_MIN_ROWS, snapshot_frame
+
+# ----------------------------
+# Dimensions
+# ----------------------------
+PEOPLE: List[str] = ["Aarav", "Isha", "Vihaan", "Diya", "Kabir", "Anaya", "Advait", "Myra", "Vivaan", "Sara"]
+REGIONS: List[str] = ["North", "South", "East", "West"]
+MONTHS: List[str] = pd.date_range("2024-01-01", periods=12, freq="MS").strftime("%b").tolist()
+PRICES = np.array([99, 199, 299, 399, 499], dtype=np.int32)
+
+DEPTS: List[str] = ["Finance", "Sales", "Ops", "HR", "IT"]
+LEVELS: List[str] = ["Junior", "Mid", "Senior"]
+LEVEL_P = [0.5, 0.35, 0.15]
+PERFORMANCE: List[str] = ["A", "B", "C"]
+PERFORMANCE_P = [0.2, 0.6, 0.2]
+JOIN_START = np.datetime64("2016-01-01")
+JOIN_END = np.datetime64("2025-07-01")
+
+DEFAULT_SEED = 42
+DEFAULT_SALES_ROWS = len(MONTHS) * len(PEOPLE)  # 120: one row per month/person
+DEFAULT_HR_ROWS = 200
+SALES_ROW_OPTIONS = [DEFAULT_SALES_ROWS, 10_000, 100_000, 1_000_000, 10_000_000]
+HR_ROW_OPTIONS = [DEFAULT_HR_ROWS, 10_000, 100_000, 1_000_000]
+
+# Independent streams so changing the HR size never changes the sales data.
+_SALES_STREAM = 0
+_HR_STREAM = 1
+
+
+def _rng(seed: int, stream: int) -> np.random.Generator:
+    return np.random.default_rng([seed, stream])
+
+
+def _readonly(values: np.ndarray) -> np.ndarray:
+    values.setflags(write=False)
+    return values
+
+
+def _categorical(codes: np.ndarray, categories: List[str], ordered: bool = False) -> pd.Categorical:
+    dtype = pd.CategoricalDtype(categories, ordered=ordered)
+    return pd.Categorical.from_codes(_readonly(codes), dtype=dtype, validate=False)
+
+
+# ----------------------------
+# Builders (pure, uncached)
+# ----------------------------
+def make_sales_df(n_rows: int = DEFAULT_SALES_ROWS, seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """Sales fact table: rows cycle Person fastest, then Month (like the original 12 x 10 grid)."""
+    rng = _rng(seed, _SALES_STREAM)
+    row = np.arange(n_rows, dtype=np.int64)
+    person_codes = (row % len(PEOPLE)).astype(np.int8)
+    month_codes = ((row // len(PEOPLE)) % len(MONTHS)).astype(np.int8)
+    region_codes = rng.integers(0, len(REGIONS), n_rows, dtype=np.int8)
+    units = rng.integers(5, 60, n_rows, dtype=np.int32)
+    price = PRICES[rng.integers(0, len(PRICES), n_rows)]
+    return pd.DataFrame({
+        "Month": _categorical(month_codes, MONTHS, ordered=True),
+        "Person": _categorical(person_codes, PEOPLE),
+        "Region": _categorical(region_codes, REGIONS),
+        "Units": _readonly(units),
+        "Price": _readonly(price),
+        "Revenue": _readonly(units * price),
+    }, copy=False)
+
+
+def make_hr_df(n_rows: int = DEFAULT_HR_ROWS, seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """Employee table with Dept/Level/Performance as categoricals."""
+    rng = _rng(seed, _HR_STREAM)
+    ids = np.char.zfill(np.arange(1, n_rows + 1).astype(str), 3)
+    n_days = int((JOIN_END - JOIN_START).astype(int)) + 1
+    join = JOIN_START + rng.integers(0, n_days, n_rows).astype("timedelta64[D]")
+    return pd.DataFrame({
+        "Employee": np.char.add("E", ids),
+        "Dept": _categorical(rng.integers(0, len(DEPTS), n_rows, dtype=np.int8), DEPTS),
+        "Level": _categorical(rng.choice(len(LEVELS), n_rows, p=LEVEL_P).astype(np.int8), LEVELS, ordered=True),
+        "Salary": _readonly(rng.integers(25000, 250000, n_rows, dtype=np.int32)),
+        "JoinDate": _readonly(join.astype("datetime64[s]")),
+        "Performance": _categorical(rng.choice(len(PERFORMANCE), n_rows, p=PERFORMANCE_P).astype(np.int8), PERFORMANCE),
+    }, copy=False)
+
+
+# ----------------------------
+# Cached loaders (one shared copy per server process)
+# ----------------------------
+# cache_resource hands every session the same (read-only) object instead of
+# unpickling a fresh copy per rerun.
+@cache_resource("Sales data", show_spinner="Generating sample sales data...")
+def load_sales_df(n_rows: int = DEFAULT_SALES_ROWS, seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    if n_rows < SNAPSHOT_MIN_ROWS:
+        return make_sales_df(n_rows, seed)
+    return snapshot_frame("sales", make_sales_df, n_rows, seed)
+
+
+@cache_resource("HR data", show_spinner="Generating sample HR data...")
+def load_hr_df(n_rows: int = DEFAULT_HR_ROWS, seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    if n_rows < SNAPSHOT_MIN_ROWS:
+        return make_hr_df(n_rows, seed)
+    return snapshot_frame("hr", make_hr_df, n_rows, seed)
@@ -0,0 +1,944 @@
+# -*- coding: utf-8 -*-
+"""
+Mini DAX evaluator for the DAX Lab.
+
+Supports a teaching subset of DAX over pandas tables:
+
+* aggregations: SUM, AVERAGE, MIN, MAX, COUNT, COUNTROWS, DISTINCTCOUNT
+* CALCULATE with boolean column predicates and table filters, ALL /
+  REMOVEFILTERS, VALUES, FILTER, DATEADD, TOPN, DIVIDE, IF, BLANK
+* measure references (``[Total Revenue]``) with context transition
+* operators ``+ - * / & = <> < <= > >= && ||``
+
+A filter context is a set of boolean row masks per table; one-to-many
+relationships propagate dimension filters to the fact table.  Aggregations
+are NumPy reductions over the masked columns, and when a measure is
+evaluated for every row of a small table (FILTER / TOPN / "by Month") the
+whole table is computed in one ``np.bincount`` pass instead of one scan per
+row.  Results are memoized per (expression, measure definitions, slicers).
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Hashable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from hub.cache import cache_resource
+from hub.datasets import MONTHS, load_hr_df, load_sales_df
+
+
+class DaxError(ValueError):
+    """Raised for syntax errors and unsupported or invalid expressions."""
+
+
+# ----------------------------
+# Parser
+# ----------------------------
+class Num(NamedTuple):
+    value: float
+
+class Str(NamedTuple):
+    value: str
+
+class Name(NamedTuple):      # bare identifier: table name or keyword (DESC, MONTH, ...)
+    name: str
+
+class Col(NamedTuple):
+    table: str
+    column: str
+
+class MeasureRef(NamedTuple):
+    name: str
+
+class Call(NamedTuple):
+    func: str
+    args: Tuple
+
+class Bin(NamedTuple):
+    op: str
+    left: object
+    right: object
+
+class Neg(NamedTuple):
+    operand: object
+
+
+_TOKEN = re.compile(r"""
+    (?P<ws>\s+|--[^\n]*|//[^\n]*)
+  | (?P<num>\d+(?:\.\d+)?)
+  | (?P<str>"(?:[^"]|"")*")
+  | (?P<quoted>'(?:[^']|'')*')
+  | (?P<bracket>\[[^\]]*\])
+  | (?P<ident>[A-Za-z_][A-Za-z0-9_.]*)
+  | (?P<op><=|>=|<>|&&|\|\||[=<>+\-*/(),&])
+""", re.VERBOSE)
+
+_PRECEDENCE = [("||",), ("&&",), ("=", "<>", "<", "<=", ">", ">="), ("&",), ("+", "-"), ("*", "/")]
+_DEFINITION = re.compile(r"^\s*([A-Za-z][^=\[\]()'\"]*?)\s*=(?![=<>])\s*(.+)$", re.DOTALL)
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens, pos = [], 0
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if not m:
+            raise DaxError(f"Unexpected character {text[pos]!r} at position {pos}")
+        pos = m.end()
+        if m.lastgroup != "ws":
+            tokens.append((m.lastgroup, m.group()))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.i = 0
+
+    def peek(self, offset: int = 0) -> Tuple[str, str]:
+        j = self.i + offset
+        return self.tokens[j] if j < len(self.tokens) else ("eof", "")
+
+    def take(self, value: Optional[str] = None) -> Tuple[str, str]:
+        tok = self.peek()
+        if value is not None and tok[1] != value:
+            raise DaxError(f"Expected {value!r} but found {tok[1] or 'end of expression'!r}")
+        self.i += 1
+        return tok
+
+    def parse(self):
+        node = self.binary(0)
+        if self.peek()[0] != "eof":
+            raise DaxError(f"Unexpected {self.peek()[1]!r}")
+        return node
+
+    def binary(self, level: int):
+        if level == len(_PRECEDENCE):
+            return self.unary()
+        node = self.binary(level + 1)
+        while self.peek()[0] == "op" and self.peek()[1] in _PRECEDENCE[level]:
+            op = self.take()[1]
+            node = Bin(op, node, self.binary(level + 1))
+        return node
+
+    def unary(self):
+        if self.peek() == ("op", "-"):
+            self.take()
+            return Neg(self.unary())
+        return self.primary()
+
+    def primary(self):
+        kind, value = self.take()
+        if kind == "num":
+            return Num(float(value))
+        if kind == "str":
+            return Str(value[1:-1].replace('""', '"'))
+        if kind == "bracket":
+            return MeasureRef(value[1:-1].strip())
+        if kind == "op" and value == "(":
+            node = self.binary(0)
+            self.take(")")
+            return node
+        if kind in ("ident", "quoted"):
+            name = value[1:-1].replace("''", "'") if kind == "quoted" else value
+            if self.peek()[0] == "bracket":
+                return Col(name, self.take()[1][1:-1].strip())
+            if kind == "ident" and self.peek() == ("op", "("):
+                self.take("(")
+                args = []
+                if self.peek() != ("op", ")"):
+                    args.append(self.binary(0))
+                    while self.peek() == ("op", ","):
+                        self.take()
+                        args.append(self.binary(0))
+                self.take(")")
+                return Call(name.upper(), tuple(args))
+            return Name(name)
+        raise DaxError(f"Unexpected {value or 'end of expression'!r}")
+
+
+def parse(text: str):
+    """Parse an expression (without a ``Name =`` prefix) into an AST."""
+    return _Parser(text).parse()
+
+
+def split_definition(text: str) -> Tuple[Optional[str], str]:
+    """``"Total = SUM(T[c])"`` -> ``("Total", "SUM(T[c])")``; plain expressions get ``None``."""
+    m = _DEFINITION.match(text)
+    return (m.group(1).strip(), m.group(2).strip()) if m else (None, text.strip())
+
+
+# ----------------------------
+# Filter context
+# ----------------------------
+# (table, columns the filter is "on", boolean mask over the table's rows)
+Filter = Tuple[str, FrozenSet[str], np.ndarray]
+
+
+class Context:
+    """Immutable set of table filters; masks per table are cached on the instance."""
+
+    __slots__ = ("filters", "_masks")
+
+    def __init__(self, filters: Tuple[Filter, ...] = ()):
+        self.filters = filters
+        self._masks: Dict[str, Optional[np.ndarray]] = {}
+
+    def without(self, table: str, columns: Optional[FrozenSet[str]] = None) -> "Context":
+        keep = tuple(f for f in self.filters
+                     if f[0] != table or (columns is not None and not f[1] & columns))
+        return self if len(keep) == len(self.filters) else Context(keep)
+
+    def with_filters(self, new: Sequence[Filter], clear_tables: Sequence[str] = ()) -> "Context":
+        """Add filters, replacing existing ones on the same columns (CALCULATE semantics)."""
+        ctx = self
+        for table in clear_tables:
+            ctx = ctx.without(table)
+        for table, cols, _ in new:
+            ctx = ctx.without(table, cols)
+        return Context(ctx.filters + tuple(new))
+
+
+class TableResult:
+    """Rows of ``table``: either whole rows (``positions``) or distinct column values (``frame``)."""
+
+    def __init__(self, table: str, columns: Sequence[str], positions: Optional[np.ndarray] = None,
+                 frame: Optional[pd.DataFrame] = None, values: Optional[np.ndarray] = None):
+        self.table = table
+        self.columns = list(columns)
+        self.positions = positions
+        self.frame = frame
+        self.values = values  # TOPN order-by values, for display
+
+    def __len__(self) -> int:
+        return len(self.positions) if self.positions is not None else len(self.frame)
+
+    def column(self, model: "DaxModel", name: str) -> np.ndarray:
+        if self.frame is not None and name in self.frame.columns:
+            return self.frame[name].to_numpy()
+        if self.positions is not None:
+            return model.column(self.table, name).to_numpy()[self.positions]
+        raise DaxError(f"Column {name} is not part of this table expression")
+
+    def to_frame(self, model: "DaxModel") -> pd.DataFrame:
+        if self.frame is not None:
+            out = self.frame.reset_index(drop=True)
+        else:
+            out = model.tables[self.table].take(self.positions).reset_index(drop=True)
+        if self.values is not None:
+            out = out.assign(Value=self.values)
+        return out
+
+
+class _Scope:
+    """Row context: the rows of a table expression being iterated (FILTER, TOPN, breakdowns)."""
+
+    def __init__(self, rows: TableResult, transition: bool = False):
+        self.rows = rows
+        self.transition = transition
+
+    def entered(self) -> "_Scope":
+        return _Scope(self.rows, transition=True)
+
+    @property
+    def n(self) -> int:
+        return len(self.rows)
+
+    @property
+    def filtered_columns(self) -> Optional[FrozenSet[str]]:
+        """Columns whose filters a context transition replaces (``None`` = whole table)."""
+        return None if self.rows.positions is not None else frozenset(self.rows.columns)
+
+
+# ----------------------------
+# Model + evaluator
+# ----------------------------
+_AGGREGATIONS = {"SUM", "AVERAGE", "MIN", "MAX", "COUNT", "COUNTROWS", "DISTINCTCOUNT"}
+_TABLE_FUNCS = {"ALL", "REMOVEFILTERS", "VALUES", "DISTINCT", "FILTER", "DATEADD", "TOPN"}
+_DATE_UNITS = {"DAY": "days", "MONTH": "months", "QUARTER": "months", "YEAR": "years"}
+Result = Union[None, float, str, pd.Timestamp, pd.DataFrame]
+
+
+def _is_blank(value) -> bool:
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+
+def _contains(node, kinds: Tuple[type, ...]) -> bool:
+    if isinstance(node, kinds):
+        return True
+    if isinstance(node, Call):
+        return any(_contains(a, kinds) for a in node.args)
+    if isinstance(node, Bin):
+        return _contains(node.left, kinds) or _contains(node.right, kinds)
+    if isinstance(node, Neg):
+        return _contains(node.operand, kinds)
+    return False
+
+
+def _isin(series: pd.Series, values) -> np.ndarray:
+    """Boolean mask of ``series`` in ``values``, via a code lookup table for categoricals."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        lut = np.zeros(len(series.cat.categories) + 1, dtype=bool)  # last slot: code -1 (NaN)
+        idx = series.cat.categories.get_indexer(pd.Index(values))
+        lut[idx[idx >= 0]] = True
+        return lut[codes]
+    return series.isin(values).to_numpy()
+
+
+class DaxModel:
+    """Named tables, one-to-many relationships, measures and a result memo."""
+
+    MEMO_SIZE = 256
+
+    def __init__(self, tables: Dict[str, pd.DataFrame], relationships: Sequence[Tuple[str, str, str, str]] = (),
+                 date_table: Optional[Tuple[str, str]] = None, measures: Optional[Dict[str, str]] = None):
+        self.tables = tables
+        # (fact table, foreign key, dimension table, key): filters flow dimension -> fact
+        self.relationships = list(relationships)
+        self.date_table = date_table
+        self.measures: Dict[str, object] = {}
+        self._table_names = {t.lower(): t for t in tables}
+        self._column_names = {t: {c.lower(): c for c in df.columns} for t, df in tables.items()}
+        self._memo: "OrderedDict[Hashable, Result]" = OrderedDict()
+        self._lock = threading.Lock()
+        for name, text in (measures or {}).items():
+            self.measures[name.lower()] = parse(text)
+
+    # --- names ---
+    def table_name(self, name: str) -> str:
+        try:
+            return self._table_names[name.lower()]
+        except KeyError:
+            raise DaxError(f"Unknown table {name!r}")
+
+    def column_name(self, table: str, column: str) -> Tuple[str, str]:
+        table = self.table_name(table)
+        try:
+            return table, self._column_names[table][column.lower()]
+        except KeyError:
+            raise DaxError(f"Unknown column {table}[{column}]")
+
+    def column(self, table: str, column: str) -> pd.Series:
+        table, column = self.column_name(table, column)
+        return self.tables[table][column]
+
+    # --- filter masks ---
+    def mask(self, table: str, ctx: Context) -> Optional[np.ndarray]:
+        """Rows of ``table`` visible in ``ctx`` (``None`` = all rows)."""
+        if table in ctx._masks:
+            return ctx._masks[table]
+        mask = None
+        for t, _, m in ctx.filters:
+            if t == table:
+                mask = m if mask is None else mask & m
+        for fact, fk, dim, pk in self.relationships:
+            if fact != table:
+                continue
+            dim_mask = self.mask(dim, ctx)
+            if dim_mask is not None:
+                allowed = self.tables[dim][pk].to_numpy()[dim_mask]
+                m = _isin(self.tables[fact][fk], allowed)
+                mask = m if mask is None else mask & m
+        ctx._masks[table] = mask
+        return mask
+
+    def _visible(self, table: str, column: str, ctx: Context) -> pd.Series:
+        col = self.tables[table][column]
+        mask = self.mask(table, ctx)
+        return col if mask is None else col[mask]
+
+    def _clears_date_table(self, table: str, cols: FrozenSet[str]) -> List[str]:
+        # A filter on the date column of a marked date table replaces every filter on that table.
+        if self.date_table and table == self.date_table[0] and self.date_table[1] in cols:
+            return [table]
+        return []
+
+    # --- public API ---
+    def slicer_context(self, slicers: Dict[Tuple[str, str], Optional[Sequence]]) -> Context:
+        filters = []
+        for (table, column), values in slicers.items():
+            if values is None:
+                continue
+            table, column = self.column_name(table, column)
+            filters.append((table, frozenset([column]), _isin(self.tables[table][column], list(values))))
+        return Context(tuple(filters))
+
+    def evaluate(self, expression: str, slicers: Optional[Dict[Tuple[str, str], Optional[Sequence]]] = None,
+                 measures: Optional[Dict[str, str]] = None, by: Optional[Tuple[str, str]] = None) -> Result:
+        """Evaluate ``expression`` under ``slicers``; memoized.
+
+        ``measures`` adds/overrides measure definitions for this call only.
+        With ``by=(table, column)`` the result is a frame with the expression
+        evaluated for each visible value of that column.
+        """
+        slicers = slicers or {}
+        measures = measures or {}
+        key = (expression.strip(), tuple(sorted(measures.items())), by,
+               tuple(sorted((k, None if v is None else tuple(sorted(map(str, v)))) for k, v in slicers.items())))
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return self._memo[key]
+        evaluator = _Evaluator(self, {n.lower(): parse(t) for n, t in measures.items()})
+        try:
+            result = evaluator.run(parse(expression), self.slicer_context(slicers), by)
+        except DaxError:
+            raise
+        except Exception as e:  # operand types the evaluator does not handle: report, never crash the page
+            raise DaxError(f"Cannot evaluate this expression ({type(e).__name__}: {e})") from e
+        with self._lock:
+            self._memo[key] = result
+            while len(self._memo) > self.MEMO_SIZE:
+                self._memo.popitem(last=False)
+        return result
+
+
+class _Evaluator:
+    def __init__(self, model: DaxModel, extra_measures: Dict[str, object]):
+        self.m = model
+        self.measures = {**model.measures, **extra_measures}
+        self._active: List[str] = []
+        # Per-evaluation caches: (measure, filter context) results and reusable filter masks.
+        # Context keys use mask identities, so the contexts are kept alive alongside the values.
+        self._measure_memo: Dict[Hashable, Tuple[object, tuple]] = {}
+        self._masks: Dict[Hashable, np.ndarray] = {}
+
+    def run(self, node, ctx: Context, by: Optional[Tuple[str, str]]) -> Result:
+        if by is not None:
+            table, column = self.m.column_name(*by)
+            rows = self._values(table, column, ctx)
+            values = self.vec(node, ctx, _Scope(rows, transition=True))
+            return pd.DataFrame({column: rows.frame[column].to_numpy(),
+                                 "Value": np.broadcast_to(self._as_float(values), (len(rows),))})
+        value = self.scalar_or_table(node, ctx)
+        if isinstance(value, TableResult):
+            return value.to_frame(self.m)
+        if isinstance(value, (np.generic,)):
+            value = value.item()
+        return None if _is_blank(value) else value
+
+    # --- dispatch ---
+    def scalar_or_table(self, node, ctx: Context):
+        if isinstance(node, Call) and node.func in _TABLE_FUNCS:
+            return self.table(node, ctx)
+        if isinstance(node, Name) and node.name.lower() in self.m._table_names:
+            return self.table(node, ctx)
+        return self.vec(node, ctx, None)
+
+    def vec(self, node, ctx: Context, scope: Optional[_Scope]):
+        """Evaluate to a scalar (``scope`` is None) or one value per scope row."""
+        if isinstance(node, Num):
+            return node.value
+        if isinstance(node, Str):
+            return node.value
+        if isinstance(node, Neg):
+            v = self.vec(node.operand, ctx, scope)
+            return None if v is None else -self._as_float(v)
+        if isinstance(node, Bin):
+            return self.binary(node, ctx, scope)
+        if isinstance(node, Col):
+            return self.row_value(node, scope)
+        if isinstance(node, MeasureRef):
+            return self.measure(node.name, ctx, scope)
+        if isinstance(node, Call):
+            return self.call(node, ctx, scope)
+        if isinstance(node, Name):
+            raise DaxError(f"{node.name} cannot be used as a value here")
+        raise DaxError(f"Unsupported expression {node!r}")
+
+    # --- values ---
+    def row_value(self, node: Col, scope: Optional[_Scope]):
+        table, column = self.m.column_name(node.table, node.column)
+        if scope is None or scope.rows.table != table:
+            raise DaxError(f"A single value for column {table}[{column}] cannot be determined; "
+                           "wrap it in an aggregation such as SUM or MAX.")
+        return scope.rows.column(self.m, column)
+
+    def measure(self, name: str, ctx: Context, scope: Optional[_Scope]):
+        key = name.lower()
+        if key not in self.measures:
+            raise DaxError(f"Unknown measure [{name}]")
+        if key in self._active:
+            raise DaxError(f"Measure [{name}] refers to itself")
+        self._active.append(key)
+        try:
+            memo_key = (key, tuple(sorted((t, tuple(sorted(c)), id(m)) for t, c, m in ctx.filters)),
+                        id(scope.rows) if scope else None)
+            if memo_key not in self._measure_memo:
+                body = self.measures[key]
+                value = self.scalar_or_table(body, ctx) if scope is None else self.vec(body, ctx, scope.entered())
+                self._measure_memo[memo_key] = (value, (ctx, scope))
+            return self._measure_memo[memo_key][0]
+        finally:
+            self._active.pop()
+
+    @staticmethod
+    def _as_float(v):
+        if v is None:
+            return np.nan
+        if isinstance(v, np.ndarray):
+            return v.astype(np.float64) if v.dtype.kind in "biuf" else v
+        return float(v) if isinstance(v, (int, float, np.number)) else v
+
+    def binary(self, node: Bin, ctx: Context, scope: Optional[_Scope]):
+        a, b = self.vec(node.left, ctx, scope), self.vec(node.right, ctx, scope)
+        op = node.op
+        if op == "&":
+            return ("" if a is None else str(a)) + ("" if b is None else str(b)) if scope is None else \
+                np.char.add(np.asarray(a, dtype=str), np.asarray(b, dtype=str))
+        if op in ("&&", "||"):
+            a, b = np.asarray(a if a is not None else False, dtype=bool), np.asarray(b if b is not None else False, dtype=bool)
+            out = a & b if op == "&&" else a | b
+            return out if scope else bool(out)
+        if op in ("=", "<>", "<", "<=", ">", ">="):
+            return self._compare(op, a, b, scope)
+        if scope is None and (a is None or b is None):
+            if op in ("+", "-") and not (a is None and b is None):
+                a, b = a or 0.0, b or 0.0
+            else:
+                return None
+        a, b = self._as_float(a), self._as_float(b)
+        if op in ("+", "-"):
+            # BLANK behaves as 0 in addition/subtraction unless both sides are blank
+            both = np.isnan(a) & np.isnan(b)
+            a, b = np.nan_to_num(a), np.nan_to_num(b)
+            out = a + b if op == "+" else a - b
+            return np.where(both, np.nan, out) if scope else float(out)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = a * b if op == "*" else np.divide(a, b)
+        return out if scope else float(out)
+
+    def _compare(self, op: str, a, b, scope: Optional[_Scope]):
+        def norm(v):
+            if isinstance(v, pd.Timestamp):
+                return np.datetime64(v)
+            if isinstance(v, np.ndarray) and v.dtype.kind == "f":
+                return np.nan_to_num(v)
+            return 0.0 if v is None else v
+        a, b = norm(a), norm(b)
+        ops = {"=": np.equal, "<>": np.not_equal, "<": np.less, "<=": np.less_equal,
+               ">": np.greater, ">=": np.greater_equal}
+        if isinstance(a, np.ndarray) and a.dtype == object or isinstance(b, np.ndarray) and b.dtype == object:
+            out = ops[op](pd.Series(a) if isinstance(a, np.ndarray) else a,
+                          pd.Series(b) if isinstance(b, np.ndarray) else b)
+            out = np.asarray(out, dtype=bool)
+        else:
+            out = ops[op](a, b)
+        return out if scope else bool(out)
+
+    # --- functions ---
+    def call(self, node: Call, ctx: Context, scope: Optional[_Scope]):
+        f, args = node.func, node.args
+        if f in _AGGREGATIONS:
+            return self.aggregate(node, ctx, scope)
+        if f == "CALCULATE":
+            if not args:
+                raise DaxError("CALCULATE needs an expression")
+            return self.calculate(args[0], args[1:], ctx, scope)
+        if f == "DIVIDE":
+            if len(args) not in (2, 3):
+                raise DaxError("DIVIDE(numerator, denominator, [alternate result])")
+            num = self._as_float(self.vec(args[0], ctx, scope))
+            den = self._as_float(self.vec(args[1], ctx, scope))
+            alt = self._as_float(self.vec(args[2], ctx, scope)) if len(args) == 3 else np.nan
+            # np.divide, not "/": a scalar 0 denominator must not raise before np.where picks alt
+            with np.errstate(divide="ignore", invalid="ignore"):
+                out = np.where((den == 0) | np.isnan(den), alt, np.divide(num, den))
+            return out if scope else (None if np.isnan(out) else float(out))
+        if f == "IF":
+            if len(args) not in (2, 3):
+                raise DaxError("IF(condition, value_if_true, [value_if_false])")
+            cond = self.vec(args[0], ctx, scope)
+            then = self.vec(args[1], ctx, scope)
+            other = self.vec(args[2], ctx, scope) if len(args) == 3 else None
+            if scope is None:
+                return then if cond else other
+            return np.where(np.asarray(cond, dtype=bool), self._as_float(then), self._as_float(other))
+        if f == "BLANK":
+            return None
+        if f in _TABLE_FUNCS:
+            raise DaxError(f"{f} returns a table; use it inside CALCULATE, COUNTROWS or as the whole expression")
+        raise DaxError(f"Unsupported function {f}")
+
+    def _agg_target(self, node: Call) -> Tuple[str, Optional[str]]:
+        if len(node.args) != 1:
+            raise DaxError(f"{node.func} takes exactly one argument")
+        arg = node.args[0]
+        if node.func == "COUNTROWS":
+            if isinstance(arg, Name):
+                return self.m.table_name(arg.name), None
+            return "", None  # table expression, handled by the caller
+        if not isinstance(arg, Col):
+            raise DaxError(f"{node.func} expects a column reference such as Sales[Revenue]")
+        return self.m.column_name(arg.table, arg.column)
+
+    @staticmethod
+    def _reduce(func: str, values: np.ndarray):
+        if func in ("COUNT", "COUNTROWS"):
+            return len(values)
+        if len(values) == 0:
+            return None
+        if func == "SUM":
+            return values.sum().item()
+        if func == "AVERAGE":
+            return float(values.mean())
+        if func == "DISTINCTCOUNT":
+            return float(len(pd.unique(values)))
+        v = values.min() if func == "MIN" else values.max()
+        return pd.Timestamp(v) if isinstance(v, np.datetime64) else v.item() if hasattr(v, "item") else v
+
+    def aggregate(self, node: Call, ctx: Context, scope: Optional[_Scope]):
+        table, column = self._agg_target(node)
+        if node.func in ("SUM", "AVERAGE"):
+            col = self.m.tables[table][column]
+            dtype = col.cat.categories.dtype if isinstance(col.dtype, pd.CategoricalDtype) else col.dtype
+            if not pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+                raise DaxError(f"{node.func} needs a numeric column; {table}[{column}] is not numeric")
+        if node.func == "COUNTROWS" and not table:
+            tbl = self.table(node.args[0], ctx)
+            if scope and scope.transition:
+                return self.per_row(node, ctx, scope)
+            return len(tbl)
+        if scope is not None and scope.transition:
+            grouped = self.grouped_aggregate(node.func, table, column, ctx, scope)
+            return grouped if grouped is not None else self.per_row(node, ctx, scope)
+        mask = self.m.mask(table, ctx)
+        if column is None:
+            return int(len(self.m.tables[table]) if mask is None else mask.sum())
+        values = self.m.tables[table][column]
+        if isinstance(values.dtype, pd.CategoricalDtype) and node.func != "DISTINCTCOUNT":
+            values = values.astype(values.cat.categories.dtype)
+        values = values.to_numpy()
+        if mask is not None:
+            values = values[mask]
+        if values.dtype.kind == "f":
+            values = values[~np.isnan(values)]
+        return self._reduce(node.func, values)
+
+    def group_ids(self, table: str, scope: _Scope) -> Optional[np.ndarray]:
+        """Scope row index for every row of ``table`` (-1 = no row), or ``None`` if not derivable."""
+        rows = scope.rows
+        n_table = len(self.m.tables[table])
+        if rows.table == table and rows.positions is not None:
+            ids = np.full(n_table, -1, dtype=np.int64)
+            ids[rows.positions] = np.arange(len(rows.positions))
+            return ids
+        link = None
+        if rows.table == table and len(rows.columns) == 1:
+            link = (rows.columns[0], rows.columns[0])
+        else:
+            for fact, fk, dim, pk in self.m.relationships:
+                if fact == table and dim == rows.table and (pk in rows.columns or rows.positions is not None):
+                    link = (fk, pk)
+        if link is None:
+            return None
+        fk, pk = link
+        keys = pd.Index(rows.column(self.m, pk))
+        if not keys.is_unique:
+            return None
+        target = self.m.tables[table][fk]
+        if isinstance(target.dtype, pd.CategoricalDtype):
+            lut = np.full(len(target.cat.categories) + 1, -1, dtype=np.int64)
+            idx = target.cat.categories.get_indexer(keys)
+            lut[idx[idx >= 0]] = np.flatnonzero(idx >= 0)
+            return lut[target.cat.codes.to_numpy()]
+        return keys.get_indexer(target)
+
+    def grouped_aggregate(self, func: str, table: str, column: Optional[str], ctx: Context,
+                          scope: _Scope) -> Optional[np.ndarray]:
+        """One bincount pass computing the aggregation for every scope row at once."""
+        ids = self.group_ids(table, scope)
+        if ids is None:
+            return None
+        # Context transition: the row's values replace filters on the iterated columns.
+        mask = self.m.mask(table, ctx.without(scope.rows.table, scope.filtered_columns))
+        keep = ids >= 0 if mask is None else (ids >= 0) & mask
+        ids = ids[keep]
+        n = scope.n
+        counts = np.bincount(ids, minlength=n).astype(np.float64)
+        if func in ("COUNT", "COUNTROWS"):
+            return counts
+        values = self.m.tables[table][column]
+        if isinstance(values.dtype, pd.CategoricalDtype) or values.dtype.kind not in "biuf":
+            if func != "DISTINCTCOUNT":
+                return None
+        values = values.to_numpy()[keep] if func != "DISTINCTCOUNT" else values.to_numpy()[keep]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if func == "SUM":
+                sums = np.bincount(ids, weights=values, minlength=n)
+                return np.where(counts > 0, sums, np.nan)
+            if func == "AVERAGE":
+                return np.bincount(ids, weights=values, minlength=n) / np.where(counts > 0, counts, np.nan)
+        grouped = pd.Series(values).groupby(ids)
+        out = {"MIN": grouped.min, "MAX": grouped.max, "DISTINCTCOUNT": grouped.nunique}[func]()
+        return out.reindex(range(n)).to_numpy(dtype=np.float64)
+
+    def per_row(self, node, ctx: Context, scope: _Scope) -> np.ndarray:
+        """Fallback context transition: evaluate ``node`` once per scope row."""
+        rows = scope.rows
+        out = np.empty(scope.n, dtype=object)
+        cols = list(rows.columns)
+        data = {c: rows.column(self.m, c) for c in cols}
+        for i in range(scope.n):
+            if rows.positions is not None:
+                m = np.zeros(len(self.m.tables[rows.table]), dtype=bool)
+                m[rows.positions[i]] = True
+                filters = [(rows.table, frozenset(self.m.tables[rows.table].columns), m)]
+            else:
+                filters = [(rows.table, frozenset([c]), self._equals_mask(rows.table, c, data[c][i]))
+                           for c in cols]
+            row_ctx = ctx.without(rows.table, scope.filtered_columns).with_filters(filters)
+            v = self.vec(node, row_ctx, None)
+            out[i] = np.nan if v is None else v
+        try:
+            return out.astype(np.float64)
+        except (TypeError, ValueError):
+            return out
+
+    def _equals_mask(self, table: str, column: str, value) -> np.ndarray:
+        key = (table, column, value)
+        if key not in self._masks:
+            self._masks[key] = _isin(self.m.tables[table][column], [value])
+        return self._masks[key]
+
+    def calculate(self, expr, filter_args: Sequence, ctx: Context, scope: Optional[_Scope]):
+        new_ctx = self.apply_filters(filter_args, ctx)
+        if scope is None:
+            return self.vec(expr, new_ctx, None)
+        touched = {t for t, _, _ in new_ctx.filters} - {t for t, _, _ in ctx.filters}
+        if scope.rows.table in touched or any(f not in ctx.filters for f in new_ctx.filters
+                                             if f[0] == scope.rows.table):
+            # Filters on the iterated table interact with the transition: evaluate row by row.
+            return self.per_row(Call("CALCULATE", (expr,) + tuple(filter_args)), ctx, scope)
+        return self.vec(expr, new_ctx, scope.entered())
+
+    def apply_filters(self, filter_args: Sequence, ctx: Context) -> Context:
+        """CALCULATE filter arguments, all evaluated in the original context ``ctx``."""
+        new: List[Filter] = []
+        clear: List[str] = []
+        removed: List[Tuple[str, Optional[FrozenSet[str]]]] = []
+        for arg in filter_args:
+            if isinstance(arg, Call) and arg.func in ("ALL", "REMOVEFILTERS"):
+                removed += self._all_targets(arg)
+                continue
+            if isinstance(arg, Bin) and arg.op in ("=", "<>", "<", "<=", ">", ">=", "&&", "||"):
+                table, cols = self._predicate_columns(arg)
+                new.append((table, cols, self._predicate_mask(arg, table, cols, ctx)))
+                clear += self.m._clears_date_table(table, cols)
+                continue
+            tbl = self.table(arg, ctx)
+            new.append(self._table_filter(tbl))
+            clear += self.m._clears_date_table(tbl.table, new[-1][1])
+        out = ctx
+        for table, cols in removed:
+            out = out.without(table, cols)
+        return out.with_filters(new, clear)
+
+    def _predicate_mask(self, node, table: str, cols: FrozenSet[str], ctx: Context) -> np.ndarray:
+        """Boolean filter ``T[c] op x`` == ``FILTER(ALL(T[c]), T[c] op x)``, tested once per distinct value."""
+        constant = not _contains(node, (Call, MeasureRef))
+        key = ("predicate", id(node))
+        if constant and key in self._masks:
+            return self._masks[key]
+        if len(cols) == 1:
+            (column,) = cols
+            rows = self._values(table, column, None)
+            keep = np.broadcast_to(np.asarray(self.vec(node, ctx, _Scope(rows)), dtype=bool), (len(rows),))
+            mask = _isin(self.m.tables[table][column], rows.frame[column][keep])
+        else:
+            rows = TableResult(table, [], positions=np.arange(len(self.m.tables[table])))
+            mask = np.asarray(self.vec(node, ctx, _Scope(rows)), dtype=bool)
+        if constant:
+            self._masks[key] = mask
+        return mask
+
+    def _predicate_columns(self, node) -> Tuple[str, FrozenSet[str]]:
+        found: List[Tuple[str, str]] = []
+
+        def walk(n):
+            if isinstance(n, Col):
+                found.append(self.m.column_name(n.table, n.column))
+            elif isinstance(n, Call):
+                if n.func not in _AGGREGATIONS:
+                    for a in n.args:
+                        walk(a)
+            elif isinstance(n, (Bin, Neg)):
+                for a in (n[1:] if isinstance(n, Bin) else n):
+                    walk(a)
+        walk(node)
+        tables = {t for t, _ in found}
+        if len(tables) != 1:
+            raise DaxError("A boolean CALCULATE filter must reference columns of exactly one table")
+        return tables.pop(), frozenset(c for _, c in found)
+
+    def _table_filter(self, tbl: TableResult) -> Filter:
+        df = self.m.tables[tbl.table]
+        if tbl.positions is not None:
+            mask = np.zeros(len(df), dtype=bool)
+            mask[tbl.positions] = True
+            return tbl.table, frozenset(df.columns), mask
+        mask = None
+        for c in tbl.columns:
+            m = _isin(df[c], tbl.frame[c].unique())
+            mask = m if mask is None else mask & m
+        return tbl.table, frozenset(tbl.columns), mask
+
+    def _all_targets(self, node: Call) -> List[Tuple[str, Optional[FrozenSet[str]]]]:
+        out = []
+        for a in node.args:
+            if isinstance(a, Name):
+                out.append((self.m.table_name(a.name), None))
+            elif isinstance(a, Col):
+                table, column = self.m.column_name(a.table, a.column)
+                out.append((table, frozenset([column])))
+            else:
+                raise DaxError(f"{node.func} expects table or column references")
+        return out
+
+    # --- table expressions ---
+    def _values(self, table: str, column: str, ctx: Optional[Context]) -> TableResult:
+        col = self.m.tables[table][column] if ctx is None else self.m._visible(table, column, ctx)
+        if isinstance(col.dtype, pd.CategoricalDtype):
+            present = np.bincount(col.cat.codes.to_numpy()[col.cat.codes.to_numpy() >= 0],
+                                  minlength=len(col.cat.categories)) > 0
+            values = col.cat.categories[present]
+        else:
+            values = pd.Index(pd.unique(col.to_numpy())).sort_values()
+        return TableResult(table, [column], frame=pd.DataFrame({column: values}))
+
+    def table(self, node, ctx: Context) -> TableResult:
+        if isinstance(node, Name):
+            table = self.m.table_name(node.name)
+            mask = self.m.mask(table, ctx)
+            n = len(self.m.tables[table])
+            return TableResult(table, list(self.m.tables[table].columns),
+                               positions=np.arange(n) if mask is None else np.flatnonzero(mask))
+        if not isinstance(node, Call) or node.func not in _TABLE_FUNCS:
+            raise DaxError("Expected a table expression (table name, ALL, VALUES, FILTER, DATEADD, TOPN)")
+        f, args = node.func, node.args
+        if f in ("ALL", "REMOVEFILTERS"):
+            if len(args) == 1 and isinstance(args[0], Name):
+                return self.table(args[0], Context())
+            if len(args) == 1 and isinstance(args[0], Col):
+                return self._values(*self.m.column_name(args[0].table, args[0].column), None)
+            raise DaxError(f"{f} expects a single table or column reference")
+        if f in ("VALUES", "DISTINCT"):
+            if len(args) != 1 or not isinstance(args[0], (Col, Name)):
+                raise DaxError(f"{f} expects a column or table reference")
+            if isinstance(args[0], Name):
+                return self.table(args[0], ctx)
+            return self._values(*self.m.column_name(args[0].table, args[0].column), ctx)
+        if f == "FILTER":
+            if len(args) != 2:
+                raise DaxError("FILTER(table, condition)")
+            rows = self.table(args[0], ctx)
+            keep = np.asarray(self.vec(args[1], ctx, _Scope(rows)), dtype=bool)
+            keep = np.broadcast_to(keep, (len(rows),))
+            if rows.positions is not None:
+                return TableResult(rows.table, rows.columns, positions=rows.positions[keep])
+            return TableResult(rows.table, rows.columns, frame=rows.frame[keep])
+        if f == "DATEADD":
+            return self.dateadd(args, ctx)
+        if f == "TOPN":
+            return self.topn(args, ctx)
+        raise DaxError(f"Unsupported table function {f}")
+
+    def dateadd(self, args: Sequence, ctx: Context) -> TableResult:
+        if len(args) != 3 or not isinstance(args[0], Col) or not isinstance(args[2], Name):
+            raise DaxError("DATEADD(dates_column, number_of_intervals, DAY|MONTH|QUARTER|YEAR)")
+        table, column = self.m.column_name(args[0].table, args[0].column)
+        n = self.vec(args[1], ctx, None)
+        unit = args[2].name.upper()
+        if unit not in _DATE_UNITS or n is None:
+            raise DaxError("DATEADD(dates_column, number_of_intervals, DAY|MONTH|QUARTER|YEAR)")
+        n = int(n) * (3 if unit == "QUARTER" else 1)
+        visible = pd.DatetimeIndex(self.m._visible(table, column, ctx).unique())
+        shifted = visible + pd.DateOffset(**{_DATE_UNITS[unit]: n})
+        all_dates = pd.DatetimeIndex(self.m.tables[table][column].unique())
+        return TableResult(table, [column], frame=pd.DataFrame({column: all_dates.intersection(shifted).sort_values()}))
+
+    def topn(self, args: Sequence, ctx: Context) -> TableResult:
+        if len(args) not in (3, 4):
+            raise DaxError("TOPN(n, table, order_by_expression, [ASC|DESC])")
+        n = self.vec(args[0], ctx, None)
+        rows = self.table(args[1], ctx)
+        order = "DESC"
+        if len(args) == 4:
+            if not isinstance(args[3], Name) or args[3].name.upper() not in ("ASC", "DESC"):
+                raise DaxError("TOPN order must be ASC or DESC")
+            order = args[3].name.upper()
+        values = np.broadcast_to(self._as_float(self.vec(args[2], ctx, _Scope(rows))), (len(rows),)).astype(np.float64)
+        keyed = np.where(np.isnan(values), -np.inf, values if order == "DESC" else -values)
+        ranked = np.argsort(-keyed, kind="stable")
+        n = int(n or 0)
+        if n < len(ranked) and n > 0:
+            cutoff = keyed[ranked[n - 1]]
+            ranked = ranked[keyed[ranked] >= cutoff]  # DAX keeps ties at the boundary
+        else:
+            ranked = ranked[:max(n, 0)]
+        if rows.positions is not None:
+            return TableResult(rows.table, rows.columns, positions=rows.positions[ranked], values=values[ranked])
+        return TableResult(rows.table, rows.columns, frame=rows.frame.iloc[ranked], values=values[ranked])
+
+
+# ----------------------------
+# Lab model over the sample data
+# ----------------------------
+LAB_MEASURES: Dict[str, str] = {
+    "Total Revenue": "SUM(Sales[Revenue])",
+    "Total Units": "SUM(Sales[Units])",
+    "Avg Price": "DIVIDE([Total Revenue], [Total Units])",
+    "Prev Month Revenue": "CALCULATE([Total Revenue], DATEADD('Date'[Date], -1, MONTH))",
+    "MoM Growth": "DIVIDE([Total Revenue] - [Prev Month Revenue], [Prev Month Revenue])",
+    "YoY Revenue": "CALCULATE([Total Revenue], DATEADD('Date'[Date], -1, YEAR))",
+    "Running Total": "CALCULATE([Total Revenue], FILTER(ALL('Date'), 'Date'[Date] <= MAX('Date'[Date])))",
+    "North Share": "DIVIDE(CALCULATE([Total Revenue], Sales[Region] = \"North\"), "
+                   "CALCULATE([Total Revenue], ALL(Sales[Region])))",
+    "Top 3 People": "TOPN(3, VALUES(Sales[Person]), [Total Revenue], DESC)",
+    "Big Orders": "CALCULATE(COUNTROWS(Sales), Sales[Units] >= 50)",
+    "Headcount": "COUNTROWS(HR)",
+    "Avg Salary": "AVERAGE(HR[Salary])",
+    "Senior Share": "DIVIDE(CALCULATE(COUNTROWS(HR), HR[Level] = \"Senior\"), COUNTROWS(HR))",
+}
+
+# pandas equivalents shown next to the lab measures (see the Home page promise)
+PANDAS_EQUIVALENTS: Dict[str, str] = {
+    "Total Revenue": "sales_df['Revenue'].sum()",
+    "Total Units": "sales_df['Units'].sum()",
+    "Avg Price": "sales_df['Revenue'].sum() / sales_df['Units'].sum()",
+    "Prev Month Revenue": "sales_df.groupby('Month')['Revenue'].sum().shift(1)",
+    "MoM Growth": "sales_df.groupby('Month')['Revenue'].sum().pct_change()",
+    "YoY Revenue": "# one year of sample data: always blank",
+    "Running Total": "sales_df.groupby('Month')['Revenue'].sum().cumsum()",
+    "North Share": "sales_df.loc[sales_df.Region == 'North', 'Revenue'].sum() / sales_df['Revenue'].sum()",
+    "Top 3 People": "sales_df.groupby('Person')['Revenue'].sum().nlargest(3)",
+    "Big Orders": "(sales_df['Units'] >= 50).sum()",
+    "Headcount": "len(hr_df)",
+    "Avg Salary": "hr_df['Salary'].mean()",
+    "Senior Share": "(hr_df['Level'] == 'Senior').mean()",
+}
+
+
+def date_table(year: int = 2024) -> pd.DataFrame:
+    """One row per sample month, related to Sales on Month."""
+    dates = pd.date_range(f"{year}-01-01", periods=len(MONTHS), freq="MS")
+    return pd.DataFrame({
+        "Date": dates,
+        "Month": pd.Categorical(MONTHS, categories=MONTHS, ordered=True),
+        "MonthNo": np.arange(1, len(MONTHS) + 1),
+        "Year": dates.year,
+    })
+
+
+@cache_resource("DAX model", show_spinner="Building DAX model...")
+def load_lab_model(n_rows: int, seed: int, hr_rows: int) -> DaxModel:
+    """Shared model (and memo) per dataset; rebuilt only when the data changes."""
+    return DaxModel(
+        tables={"Sales": load_sales_df(n_rows, seed), "Date": date_table(), "HR": load_hr_df(hr_rows, seed)},
+        relationships=[("Sales", "Month", "Date", "Month")],
+        date_table=("Date", "Date"),
+        measures=LAB_MEASURES,
+    )
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Dataset export (CSV, Parquet, XLSX) for the download buttons.
+
+Files are written chunk by chunk into a ``SpooledTemporaryFile`` (memory
+first, disk once it grows past ``SPOOL_MAX_BYTES``), so a large table is
+never rendered as one giant string.  ``lazy_export`` gives the download
+buttons a callable instead of bytes: nothing is serialized until the user
+clicks.  Small payloads are cached per (dataset, filter, format) for a few
+minutes; large ones are rebuilt on each click so no process keeps them.
+"""
+
+import tempfile
+from typing import BinaryIO, Callable, Dict, Hashable, List, Tuple
+
+import pandas as pd
+
+from hub import has_module
+from hub.cache import cache_resource
+
+CHUNK_ROWS = 100_000
+SPOOL_MAX_BYTES = 32 * 1024 * 1024
+CACHE_MAX_ROWS = 100_000  # larger exports are not kept in memory between clicks
+CACHE_TTL = "10m"
+XLSX_MAX_ROWS = 1_048_575  # Excel sheet limit minus the header row
+XLSX_OFFER_ROWS = 100_000  # openpyxl writes ~100k rows in ~11 s; larger tables are offered CSV/Parquet only
+
+
+# ----------------------------
+# Writers
+# ----------------------------
+def write_csv(df: pd.DataFrame, fh: BinaryIO, chunk_rows: int = CHUNK_ROWS) -> None:
+    """UTF-8 CSV without index; only one chunk is held as text at a time."""
+    if df.empty:
+        fh.write(df.to_csv(index=False).encode("utf-8"))
+        return
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        fh.write(chunk.to_csv(index=False, header=start == 0).encode("utf-8"))
+
+
+def write_parquet(df: pd.DataFrame, fh: BinaryIO, chunk_rows: int = CHUNK_ROWS) -> None:
+    """Parquet with one row group per chunk (requires pyarrow)."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(fh, schema) as writer:
+        for start in range(0, max(len(df), 1), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def write_xlsx(df: pd.DataFrame, fh: BinaryIO, chunk_rows: int = CHUNK_ROWS) -> None:
+    """Single-sheet workbook streamed with openpyxl's write-only mode, one chunk at a time."""
+    from openpyxl import Workbook
+
+    if len(df) > XLSX_MAX_ROWS:
+        raise ValueError(f"XLSX holds at most {XLSX_MAX_ROWS:,} rows; got {len(df):,}. Use CSV or Parquet.")
+    workbook = Workbook(write_only=True)  # rows go to a temp file, not an in-memory sheet
+    sheet = workbook.create_sheet("Data")
+    sheet.append([str(c) for c in df.columns])
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        chunk = chunk.astype(object).where(chunk.notna(), None)  # NaN/NaT -> empty cells
+        for row in chunk.itertuples(index=False, name=None):
+            sheet.append(row)
+    workbook.save(fh)
+
+
+# name -> (file extension, mime type, writer, required module or "")
+FORMATS: Dict[str, Tuple[str, str, Callable[..., None], str]] = {
+    "CSV": ("csv", "text/csv", write_csv, ""),
+    "Parquet": ("parquet", "application/vnd.apache.parquet", write_parquet, "pyarrow"),
+    "XLSX": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", write_xlsx, "openpyxl"),
+}
+
+
+def available_formats(n_rows: int = 0) -> List[str]:
+    """Formats whose optional dependency is installed and that export ``n_rows`` interactively."""
+    names = []
+    for name, (_, _, _, needs) in FORMATS.items():
+        if needs and not has_module(needs):
+            continue
+        if name == "XLSX" and n_rows > XLSX_OFFER_ROWS:
+            continue
+        names.append(name)
+    return names
+
+
+def export_file(df: pd.DataFrame, fmt: str) -> BinaryIO:
+    """Spooled temporary file holding ``df`` in ``fmt``, rewound to the start."""
+    writer = FORMATS[fmt][2]
+    fh = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    writer(df, fh)
+    fh.seek(0)
+    return fh
+
+
+def export_bytes(df: pd.DataFrame, fmt: str = "CSV") -> bytes:
+    with export_file(df, fmt) as fh:
+        return fh.read()
+
+
+# ----------------------------
+# Lazy, cached payloads for st.download_button
+# ----------------------------
+# ``key`` identifies the (dataset, filter) pair; the frame is not hashed
+# (leading underscore).  Only frames up to CACHE_MAX_ROWS get here, so the
+# cache holds at most a few MB per entry, and entries expire after CACHE_TTL.
+@cache_resource("Export files", max_entries=16, ttl=CACHE_TTL, show_spinner=False)
+def _cached_export(key: Hashable, fmt: str, _df: pd.DataFrame) -> bytes:
+    return export_bytes(_df, fmt)
+
+
+def _export(key: Hashable, fmt: str, frame: Callable[[], pd.DataFrame]) -> bytes:
+    df = frame()
+    if len(df) > CACHE_MAX_ROWS:
+        return export_bytes(df, fmt)  # released once Streamlit has served it
+    return _cached_export(key, fmt, _df=df)
+
+
+def lazy_export(key: Hashable, fmt: str, frame: Callable[[], pd.DataFrame]) -> Callable[[], bytes]:
+    """Zero-argument callable for ``st.download_button(data=...)``."""
+    return lambda: _export(key, fmt, frame)
+
+
+def file_name(stem: str, fmt: str) -> str:
+    return f"{stem}.{FORMATS[fmt][0]}"
+
+
+def mime_type(fmt: str) -> str:
+    return FORMATS[fmt][1]
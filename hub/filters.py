@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Precomputed filter index over the categorical columns of a dataset.
+
+For every indexed column the row positions are grouped by category code
+once (a stable argsort plus per-code offsets).  A filter is then answered
+by reading the positions of the selected values from the most selective
+column and checking the remaining columns only on those candidate rows, so
+the cost scales with the result size instead of with the whole table.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from hub.cache import cache_resource
+from hub.datasets import load_sales_df
+
+
+class FilterIndex:
+    """Row positions grouped by value for each categorical column of ``df``."""
+
+    def __init__(self, df: pd.DataFrame, columns: Sequence[str]):
+        self.df = df
+        self._codes: Dict[str, np.ndarray] = {}
+        self._categories: Dict[str, pd.Index] = {}
+        self._order: Dict[str, np.ndarray] = {}
+        self._offsets: Dict[str, np.ndarray] = {}
+        for col in columns:
+            cat = df[col].cat
+            codes = cat.codes.to_numpy()
+            self._codes[col] = codes
+            self._categories[col] = cat.categories
+            self._order[col] = np.argsort(codes, kind="stable")
+            counts = np.bincount(codes, minlength=len(cat.categories))
+            self._offsets[col] = np.concatenate(([0], np.cumsum(counts)))
+
+    def _value_codes(self, col: str, values: Iterable) -> np.ndarray:
+        codes = self._categories[col].get_indexer(list(values))
+        return np.unique(codes[codes >= 0])
+
+    def _group_size(self, col: str, codes: np.ndarray) -> int:
+        offsets = self._offsets[col]
+        return int((offsets[codes + 1] - offsets[codes]).sum())
+
+    def _positions(self, col: str, codes: np.ndarray) -> np.ndarray:
+        offsets, order = self._offsets[col], self._order[col]
+        if len(codes) == 1:
+            c = codes[0]
+            return order[offsets[c]:offsets[c + 1]]
+        return np.concatenate([order[offsets[c]:offsets[c + 1]] for c in codes])
+
+    def positions(self, filters: Dict[str, Optional[Iterable]]) -> Optional[np.ndarray]:
+        """Sorted row positions matching every filter, or ``None`` for "all rows".
+
+        ``filters`` maps an indexed column to the allowed values; a value of
+        ``None`` leaves that column unfiltered.
+        """
+        selected = {col: self._value_codes(col, values)
+                    for col, values in filters.items() if values is not None}
+        # Drop filters that keep every category: they cannot remove rows.
+        selected = {col: codes for col, codes in selected.items()
+                    if len(codes) < len(self._categories[col])}
+        if not selected:
+            return None
+        if any(len(codes) == 0 for codes in selected.values()):
+            return np.empty(0, dtype=np.intp)
+        driver = min(selected, key=lambda col: self._group_size(col, selected[col]))
+        pos = self._positions(driver, selected.pop(driver))
+        for col, codes in selected.items():
+            col_codes = self._codes[col][pos]
+            keep = col_codes == codes[0] if len(codes) == 1 else np.isin(col_codes, codes)
+            pos = pos[keep]
+        return np.sort(pos)
+
+    def filter(self, filters: Dict[str, Optional[Iterable]]) -> pd.DataFrame:
+        """Matching rows: ``df`` itself when nothing is filtered, else a ``take``."""
+        pos = self.positions(filters)
+        return self.df if pos is None else self.df.take(pos)
+
+    def count(self, filters: Dict[str, Optional[Iterable]]) -> int:
+        pos = self.positions(filters)
+        return len(self.df) if pos is None else len(pos)
+
+    def values(self, col: str) -> List:
+        """Categories of ``col`` that occur at least once."""
+        offsets = self._offsets[col]
+        present = np.flatnonzero(np.diff(offsets))
+        return self._categories[col][present].tolist()
+
+
+SALES_INDEX_COLUMNS = ["Month", "Person", "Region"]
+
+
+@cache_resource("Sales filter index", show_spinner="Indexing sales data...")
+def load_sales_index(n_rows: int, seed: int) -> FilterIndex:
+    """Filter index over the cached sales table for ``(n_rows, seed)``."""
+    return FilterIndex(load_sales_df(n_rows, seed), SALES_INDEX_COLUMNS)
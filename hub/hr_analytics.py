@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+HR analytics for the "HR Attrition Insights" mini project.
+
+Everything is computed from a few sorted arrays, never per employee:
+headcount at any date is ``np.searchsorted`` on the sorted join dates,
+monthly curves per department are a ``bincount`` of hires followed by a
+``cumsum``, and salary bands come from one sort on a (Dept x Level, Salary)
+key with each group's quantiles read at computed offsets.  The build is
+O(n log n) and every query afterwards only touches the small outputs, so the
+same code serves the 200-row sample and million-employee datasets.
+
+The sample has no leave dates, so headcount is cumulative hires up to the
+``as_of`` date (by default the last possible join date, which keeps results
+independent of today's date).  The attrition risk score is a weighted blend
+of three signals, each scaled to 0..1:
+
+* Performance: rating C = 1, B = 0.4, A = 0.
+* Pay: 1 - the employee's percentile within their Dept x Level band.
+* Tenure: ``0.5 ** (years / TENURE_HALF_LIFE)``; new joiners leave most often.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from hub.cache import cache_data, cache_resource
+from hub.charts import ChartPayload, cap_points, vega_spec
+from hub.datasets import JOIN_END, load_hr_df
+
+TENURE_EDGES = np.array([0, 1, 2, 3, 5, 7], dtype=np.float64)  # years, lower bounds
+TENURE_BANDS: List[str] = ["<1y", "1-2y", "2-3y", "3-5y", "5-7y", "7y+"]
+TENURE_HALF_LIFE = 2.0
+
+PERFORMANCE_RISK: Dict[str, float] = {"A": 0.0, "B": 0.4, "C": 1.0}
+RISK_WEIGHTS: Dict[str, float] = {"Performance": 0.45, "Pay": 0.30, "Tenure": 0.25}
+RISK_EDGES = np.array([40.0, 65.0])  # score thresholds for Medium and High
+RISK_BANDS: List[str] = ["Low", "Medium", "High"]
+
+SALARY_QUANTILES = {"P25": 0.25, "Median": 0.5, "P75": 0.75}
+
+
+class HRAnalytics:
+    """Headcount, tenure, salary-band and risk metrics for an HR frame, as of one date."""
+
+    def __init__(self, df: pd.DataFrame, as_of=JOIN_END):
+        self.as_of = np.datetime64(as_of, "D")
+        join = df["JoinDate"].to_numpy().astype("datetime64[D]")
+        employed = join <= self.as_of
+        if not employed.all():
+            df, join = df[employed], join[employed]
+        self.departments: pd.Index = df["Dept"].cat.categories
+        self.levels: pd.Index = df["Level"].cat.categories
+        dept = df["Dept"].cat.codes.to_numpy().astype(np.intp)
+        level = df["Level"].cat.codes.to_numpy().astype(np.intp)
+        salary = df["Salary"].to_numpy()
+        self.employees: pd.Series = df["Employee"]  # only the top-risk rows are materialized
+        self.dept_codes, self.level_codes, self.salary = dept, level, salary
+        n_dept, n_level = len(self.departments), len(self.levels)
+
+        # Headcount: sorted join dates for point queries, hires per (month, dept) for curves.
+        self.join_sorted = np.sort(join)
+        first = join.min() if len(join) else self.as_of
+        self.months = np.arange(first.astype("datetime64[M]"), self.as_of.astype("datetime64[M]") + 1)
+        month = (join.astype("datetime64[M]") - self.months[0]).astype(np.intp)
+        self.hires = np.bincount(month * n_dept + dept, minlength=len(self.months) * n_dept) \
+            .reshape(len(self.months), n_dept)
+
+        # Tenure in years and its band.
+        self.tenure = (self.as_of - join).astype(np.int64) / 365.25
+        self.tenure_band = np.searchsorted(TENURE_EDGES, self.tenure, side="right") - 1
+
+        # Salary bands: one sort by (group, salary); each group is a contiguous run.
+        group = dept * n_level + level
+        key = (group.astype(np.int64) << 32) | salary.astype(np.int64)
+        order = np.argsort(key)
+        key = key[order]
+        self.band_counts = np.bincount(group, minlength=n_dept * n_level)
+        self.band_starts = np.concatenate(([0], np.cumsum(self.band_counts)[:-1]))
+        self.band_salaries = salary[order]
+        # Rank within the band; equal salaries share the lowest rank ("min" ties).
+        run_start = np.ones(len(key), dtype=bool)
+        run_start[1:] = key[1:] != key[:-1]
+        first = np.maximum.accumulate(np.where(run_start, np.arange(len(key)), 0))
+        rank = np.empty(len(key), dtype=np.float64)
+        rank[order] = first - self.band_starts[group[order]]
+        pay_pct = rank / np.maximum(self.band_counts[group] - 1, 1)
+
+        # Risk score, 0..100.
+        perf_risk = np.array([PERFORMANCE_RISK[p] for p in df["Performance"].cat.categories])
+        self.factors = {
+            "Performance": perf_risk[df["Performance"].cat.codes.to_numpy()],
+            "Pay": 1.0 - pay_pct,
+            "Tenure": 0.5 ** (self.tenure / TENURE_HALF_LIFE),
+        }
+        self.risk = 100 * sum(RISK_WEIGHTS[k] * v for k, v in self.factors.items())
+        self.risk_band = np.searchsorted(RISK_EDGES, self.risk, side="right")
+
+    def __len__(self) -> int:
+        return len(self.employees)
+
+    # ----------------------------
+    # Headcount
+    # ----------------------------
+    def headcount_on(self, dates) -> np.ndarray:
+        """Employees who had joined by each of ``dates`` (inclusive)."""
+        return np.searchsorted(self.join_sorted, np.asarray(dates, dtype="datetime64[D]"), side="right")
+
+    def headcount(self, by_dept: bool = False) -> pd.DataFrame:
+        """Month-end headcount (and hires) per month, optionally one column per department."""
+        index = pd.DatetimeIndex(self.months.astype("datetime64[ns]"), name="Month")
+        if by_dept:
+            return pd.DataFrame(np.cumsum(self.hires, axis=0), index=index, columns=list(self.departments))
+        month_ends = np.minimum((self.months + 1).astype("datetime64[D]") - 1, self.as_of)
+        return pd.DataFrame({"Hires": self.hires.sum(axis=1), "Headcount": self.headcount_on(month_ends)},
+                            index=index)
+
+    def hires_since(self, months: int) -> int:
+        start = (self.as_of.astype("datetime64[M]") - months + 1).astype("datetime64[D]")
+        return int(len(self) - self.headcount_on([start - 1])[0])
+
+    # ----------------------------
+    # Tenure
+    # ----------------------------
+    def tenure_distribution(self, by_dept: bool = False) -> pd.DataFrame:
+        """Employees per tenure band (rows), optionally split by department (columns)."""
+        index = pd.CategoricalIndex(TENURE_BANDS, categories=TENURE_BANDS, ordered=True, name="Tenure")
+        if not by_dept:
+            return pd.DataFrame({"Employees": np.bincount(self.tenure_band, minlength=len(TENURE_BANDS))},
+                                index=index)
+        n_dept = len(self.departments)
+        counts = np.bincount(self.tenure_band * n_dept + self.dept_codes, minlength=len(TENURE_BANDS) * n_dept)
+        return pd.DataFrame(counts.reshape(len(TENURE_BANDS), n_dept), index=index, columns=list(self.departments))
+
+    def median_tenure(self) -> float:
+        return float(np.median(self.tenure)) if len(self) else float("nan")
+
+    # ----------------------------
+    # Salary bands
+    # ----------------------------
+    def _band_quantile(self, q: float) -> np.ndarray:
+        """Linear-interpolated quantile of every Dept x Level group (NaN when empty)."""
+        counts, values = self.band_counts, self.band_salaries
+        if not len(values):
+            return np.full(len(counts), np.nan)
+        pos = self.band_starts + np.maximum(counts - 1, 0) * q
+        lo = np.floor(pos).astype(np.intp)
+        hi = np.minimum(np.ceil(pos).astype(np.intp), len(values) - 1)
+        lo = np.minimum(lo, len(values) - 1)
+        out = values[lo] + (values[hi] - values[lo]) * (pos - np.floor(pos))
+        return np.where(counts > 0, out, np.nan)
+
+    def salary_bands(self) -> pd.DataFrame:
+        """Employees, min, quartiles and max salary for every Dept x Level."""
+        index = pd.MultiIndex.from_product([self.departments, self.levels], names=["Dept", "Level"])
+        out = pd.DataFrame({"Employees": self.band_counts}, index=index)
+        out["Min"] = self._band_quantile(0.0)
+        for name, q in SALARY_QUANTILES.items():
+            out[name] = self._band_quantile(q)
+        out["Max"] = self._band_quantile(1.0)
+        return out.reset_index()
+
+    # ----------------------------
+    # Attrition risk
+    # ----------------------------
+    def risk_summary(self) -> pd.DataFrame:
+        """Average risk and employees per risk band for every department."""
+        n_dept, n_band = len(self.departments), len(RISK_BANDS)
+        counts = np.bincount(self.dept_codes, minlength=n_dept)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avg = np.bincount(self.dept_codes, weights=self.risk, minlength=n_dept) / counts
+        bands = np.bincount(self.dept_codes * n_band + self.risk_band, minlength=n_dept * n_band).reshape(n_dept, n_band)
+        out = pd.DataFrame(bands, columns=RISK_BANDS, index=pd.Index(self.departments, name="Dept"))
+        out.insert(0, "Avg risk", np.round(avg, 1))
+        out.insert(0, "Employees", counts)
+        return out.reset_index()
+
+    def high_risk_share(self) -> float:
+        return float((self.risk_band == len(RISK_BANDS) - 1).mean()) if len(self) else 0.0
+
+    def top_risk(self, k: int = 10) -> pd.DataFrame:
+        """The ``k`` highest-risk employees with their risk factors (argpartition, no full sort)."""
+        k = min(k, len(self))
+        top = np.argpartition(-self.risk, k - 1)[:k] if k else np.empty(0, dtype=np.intp)
+        top = top[np.argsort(-self.risk[top], kind="stable")]
+        out = pd.DataFrame({
+            "Employee": self.employees.iloc[top].to_numpy(),
+            "Dept": self.departments[self.dept_codes[top]],
+            "Level": self.levels[self.level_codes[top]],
+            "Salary": self.salary[top],
+            "Tenure (y)": np.round(self.tenure[top], 1),
+        })
+        for name, values in self.factors.items():
+            out[name] = np.round(values[top], 2)
+        out["Risk"] = np.round(self.risk[top], 1)
+        return out
+
+
+@cache_resource("HR analytics", show_spinner="Computing HR analytics...")
+def load_hr_analytics(n_rows: int, seed: int) -> HRAnalytics:
+    return HRAnalytics(load_hr_df(n_rows, seed))
+
+
+# ----------------------------
+# Charts (cached specs, same path as the Charts Gallery)
+# ----------------------------
+def headcount_chart(hr: HRAnalytics) -> ChartPayload:
+    import altair as alt
+
+    frame = hr.headcount(by_dept=True).rename_axis(columns="Dept").stack().rename("Headcount").reset_index()
+    chart = alt.Chart().mark_line().encode(
+        x=alt.X("Month:T"), y=alt.Y("Headcount:Q"), color="Dept:N",
+        tooltip=[alt.Tooltip("Month:T", format="%b %Y"), "Dept:N", alt.Tooltip("Headcount:Q", format=",")])
+    return ChartPayload(frame, vega_spec(chart), len(hr))
+
+
+def tenure_chart(hr: HRAnalytics) -> ChartPayload:
+    import altair as alt
+
+    frame = hr.tenure_distribution(by_dept=True).rename_axis(columns="Dept").stack().rename("Employees").reset_index()
+    frame["Tenure"] = frame["Tenure"].astype(str)
+    chart = alt.Chart().mark_bar().encode(
+        x=alt.X("Tenure:O", sort=TENURE_BANDS), y=alt.Y("Employees:Q"), color="Dept:N",
+        tooltip=["Tenure:O", "Dept:N", alt.Tooltip("Employees:Q", format=",")])
+    return ChartPayload(frame, vega_spec(chart), len(hr))
+
+
+HR_CHARTS = {"Headcount": headcount_chart, "Tenure": tenure_chart}
+
+
+@cache_data("HR charts", max_entries=16, show_spinner=False)
+def hr_chart(chart: str, n_rows: int, seed: int) -> ChartPayload:
+    return cap_points(HR_CHARTS[chart](load_hr_analytics(n_rows, seed)))
@@ -0,0 +1,555 @@
+# -*- coding: utf-8 -*-
+"""
+Executable Power Query steps.
+
+A ``Query`` is an immutable chain of steps, built lazily like an M query:
+every ``.promote_headers()``, ``.group_by(...)`` etc. returns a new query
+and nothing is read until the query is run.  Running it streams the source
+as DataFrame chunks through generator operators, so memory is bounded by
+the chunk size plus the state a step genuinely needs:
+
+* Group By / Pivot keep one partial aggregate per group,
+* Remove Duplicates keeps a set of 64-bit row hashes,
+* Fill Down carries the last non-null value across chunks,
+* Merge holds the (small) right-hand lookup table.
+
+Each run records per-step row counts and self time in ``StepStats``.
+"""
+
+import io
+import tempfile
+from dataclasses import dataclass
+from time import perf_counter
+from typing import (BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple,
+                    Union)
+
+import numpy as np
+import pandas as pd
+
+from hub import has_module
+
+CHUNK_ROWS = 100_000
+TYPES = ("text", "int", "float", "date", "bool")
+AGGREGATIONS = ("sum", "count", "rows", "mean", "min", "max")  # count = non-null values
+
+Chunks = Iterator[pd.DataFrame]
+Source = Union[str, bytes, BinaryIO]
+
+_HAS_PYARROW = has_module("pyarrow")
+
+
+def _column_names(n: int) -> List[str]:
+    return [f"Column{i}" for i in range(1, n + 1)]
+
+
+# ----------------------------
+# Sources
+# ----------------------------
+def _rewind(source: Source):
+    """Path or file object positioned at the start (queries may run more than once)."""
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+
+class CsvSource:
+    """Text columns ``Column1..N``, like Power Query before Promote Headers."""
+
+    def __init__(self, source: Source, chunk_rows: int = CHUNK_ROWS, delimiter: str = ","):
+        self.source = source
+        self.chunk_rows = chunk_rows
+        self.delimiter = delimiter
+        self.name = "Source (CSV)"
+
+    def __call__(self) -> Chunks:
+        reader = pd.read_csv(_rewind(self.source), header=None, dtype=str, sep=self.delimiter,
+                             chunksize=self.chunk_rows, skip_blank_lines=True)
+        with reader:
+            for chunk in reader:
+                chunk.columns = _column_names(chunk.shape[1])
+                yield chunk
+
+
+class ExcelSource:
+    """First (or named) sheet, streamed row by row with openpyxl's read-only mode."""
+
+    def __init__(self, source: Source, chunk_rows: int = CHUNK_ROWS, sheet: Optional[str] = None):
+        if not has_module("openpyxl"):
+            raise ImportError("Reading Excel files needs openpyxl (pip install openpyxl)")
+        self.source = source
+        self.chunk_rows = chunk_rows
+        self.sheet = sheet
+        self.name = "Source (Excel)"
+
+    def __call__(self) -> Chunks:
+        from openpyxl import load_workbook
+
+        wb = load_workbook(_rewind(self.source), read_only=True, data_only=True)
+        try:
+            ws = wb[self.sheet] if self.sheet else wb.worksheets[0]
+            rows: List[tuple] = []
+            for row in ws.iter_rows(values_only=True):
+                rows.append(tuple(None if v is None else str(v) for v in row))
+                if len(rows) == self.chunk_rows:
+                    yield self._frame(rows)
+                    rows = []
+            if rows:
+                yield self._frame(rows)
+        finally:
+            wb.close()
+
+    @staticmethod
+    def _frame(rows: List[tuple]) -> pd.DataFrame:
+        width = max(len(r) for r in rows)
+        return pd.DataFrame([r + (None,) * (width - len(r)) for r in rows], columns=_column_names(width))
+
+
+class FrameSource:
+    """An in-memory DataFrame served in slices (e.g. the app's sample data)."""
+
+    def __init__(self, df: pd.DataFrame, chunk_rows: int = CHUNK_ROWS, name: str = "Source (table)"):
+        self.df = df
+        self.chunk_rows = chunk_rows
+        self.name = name
+
+    def __call__(self) -> Chunks:
+        for start in range(0, len(self.df), self.chunk_rows):
+            yield self.df.iloc[start:start + self.chunk_rows]
+
+
+# ----------------------------
+# Streaming steps (one chunk in, one chunk out)
+# ----------------------------
+class PromoteHeaders:
+    name = "Promote Headers"
+
+    def __call__(self, chunks: Chunks) -> Chunks:
+        header: Optional[List[str]] = None
+        for chunk in chunks:
+            if header is None:
+                if chunk.empty:
+                    continue
+                seen: Dict[str, int] = {}
+                header = []
+                for i, v in enumerate(chunk.iloc[0].tolist(), start=1):
+                    h = f"Column{i}" if v is None or v != v or str(v).strip() == "" else str(v).strip()
+                    seen[h] = seen.get(h, 0) + 1
+                    header.append(h if seen[h] == 1 else f"{h}_{seen[h] - 1}")
+                chunk = chunk.iloc[1:]
+            yield chunk.set_axis(header, axis=1)
+
+
+class ChangeTypes:
+    """Convert columns; values that fail to convert become null (Power Query's "Error")."""
+
+    def __init__(self, types: Dict[str, str]):
+        unknown = set(types.values()) - set(TYPES)
+        if unknown:
+            raise ValueError(f"Unknown types {sorted(unknown)}; use one of {TYPES}")
+        self.types = dict(types)
+        self.name = "Change Types"
+
+    @staticmethod
+    def _numbers(values: pd.Series) -> pd.Series:
+        if _HAS_PYARROW and values.dtype.kind not in "biuf":
+            import pyarrow as pa
+            import pyarrow.compute as pc
+
+            try:  # one vectorized cast; only chunks with bad values take the slow path
+                cast = pc.cast(pa.array(values, type=pa.string(), from_pandas=True), pa.float64())
+                return pd.Series(cast.to_numpy(zero_copy_only=False), index=values.index)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                pass
+        return pd.to_numeric(values, errors="coerce").astype("float64")
+
+    @classmethod
+    def convert(cls, values: pd.Series, kind: str) -> pd.Series:
+        if kind == "int":
+            return cls._numbers(values).round().astype("Int64")
+        if kind == "float":
+            return cls._numbers(values)
+        if kind == "date":
+            return pd.to_datetime(values, errors="coerce", format="mixed")
+        if kind == "bool":
+            lowered = values.astype("string").str.strip().str.lower()
+            return lowered.map({"true": True, "false": False, "1": True, "0": False, "yes": True,
+                                "no": False}).astype("boolean")
+        return values.astype("string")
+
+    def __call__(self, chunks: Chunks) -> Chunks:
+        for chunk in chunks:
+            yield chunk.assign(**{c: self.convert(chunk[c], t) for c, t in self.types.items() if c in chunk})
+
+
+class SplitColumn:
+    """Split ``column`` by ``delimiter`` into ``column.1 .. column.N`` (left-most splits)."""
+
+    def __init__(self, column: str, delimiter: str, parts: int = 2):
+        if not delimiter:
+            raise ValueError("Split Column needs a delimiter")
+        self.column = column
+        self.delimiter = delimiter
+        self.parts = max(2, parts)
+        self.name = f"Split Column ({column})"
+
+    def __call__(self, chunks: Chunks) -> Chunks:
+        names = [f"{self.column}.{i}" for i in range(1, self.parts + 1)]
+        for chunk in chunks:
+            split = chunk[self.column].astype("string").str.split(self.delimiter, n=self.parts - 1, expand=True)
+            split = split.reindex(columns=range(self.parts)).astype("string")
+            split.columns = names
+            at = chunk.columns.get_loc(self.column)
+            yield pd.concat([chunk.iloc[:, :at], split, chunk.iloc[:, at + 1:]], axis=1)
+
+
+class Merge:
+    """Left/inner join with a lookup query; the right side is read once and kept as a hash table."""
+
+    def __init__(self, right: "Query", on: Sequence[str], how: str = "left"):
+        if how not in ("left", "inner"):
+            raise ValueError("Streaming merge supports how='left' or 'inner'")
+        self.right = right
+        self.on = list(on)
+        self.how = how
+        self.name = f"Merge Queries ({', '.join(self.on)})"
+
+    def __call__(self, chunks: Chunks) -> Chunks:
+        right = self.right.collect().drop_duplicates(self.on)
+        for chunk in chunks:
+            yield chunk.merge(right, on=self.on, how=self.how)
+
+
+class Append:
+    """Stack other queries below this one; missing columns are null."""
+
+    def __init__(self, others: Sequence["Query"]):
+        self.others = list(others)
+        self.name = "Append Queries"
+
+    def __call__(self, chunks: Chunks) -> Chunks:
+        columns: Optional[pd.Index] = None
+        for chunk in chunks:
+            columns = chunk.columns if columns is None else columns.union(chunk.columns, sort=False)
+            yield chunk
+        for other in self.others:
+            for chunk in other.chunks():
+                yield chunk if columns is None else chunk.reindex(columns=columns.union(chunk.columns, sort=False))
+
+
+class Unpivot:
+    """Melt ``columns`` (or every column not in ``keep``) into Attribute/Value pairs."""
+
+    def __init__(self, columns: Sequence[str] = (), keep: Sequence[str] = (),
+                 attribute: str = "Attribute", value: str = "Value"):
+        if not columns and not keep:
+            raise ValueError("Unpivot needs the columns to unpivot or the columns to keep")
+        self.columns = list(columns)
+        self.keep = list(keep)
+        self.attribute = attribute
+        self.value = value
+        self.name = "Unpivot Columns"
+
+    def __call__(self, chunks: Chunks) -> Chunks:
+        for chunk in chunks:
+            value_vars = self.columns or [c for c in chunk.columns if c not in self.keep]
+            id_vars = [c for c in chunk.columns if c not in value_vars]
+            out = chunk.melt(id_vars=id_vars, value_vars=value_vars, var_name=self.attribute, value_name=self.value)
+            yield out[out[self.value].notna()]  # Power Query drops nulls when unpivoting
+
+
+class FillDown:
+    """Forward-fill nulls; the last value of each column carries over into the next chunk."""
+
+    def __init__(self, columns: Sequence[str]):
+        self.columns = list(columns)
+        self.name = "Fill Down"
+
+    def __call__(self, chunks: Chunks) -> Chunks:
+        carry: Dict[str, object] = {}
+        for chunk in chunks:
+            if chunk.empty:
+                yield chunk
+                continue
+            filled = {}
+            for c in self.columns:
+                col = chunk[c]
+                if c in carry and pd.isna(col.iloc[0]):
+                    col = col.copy()
+                    col.iloc[0] = carry[c]
+                col = col.ffill()
+                last = col.iloc[-1]
+                if not pd.isna(last):
+                    carry[c] = last
+                filled[c] = col
+            yield chunk.assign(**filled)
+
+
+class RemoveDuplicates:
+    """Keep the first occurrence of each row (or ``columns`` key) using a set of row hashes."""
+
+    def __init__(self, columns: Sequence[str] = ()):
+        self.columns = list(columns)
+        self.name = "Remove Duplicates"
+
+    def __call__(self, chunks: Chunks) -> Chunks:
+        seen: set = set()
+        for chunk in chunks:
+            key = chunk[self.columns] if self.columns else chunk
+            hashes = pd.util.hash_pandas_object(key, index=False).to_numpy()
+            first = ~pd.Series(hashes).duplicated().to_numpy()
+            if seen:
+                first &= ~np.fromiter(map(seen.__contains__, hashes.tolist()), dtype=bool, count=len(hashes))
+            seen.update(hashes[first].tolist())
+            yield chunk[first]
+
+
+# ----------------------------
+# Blocking steps (incremental state, one chunk out at the end)
+# ----------------------------
+class GroupBy:
+    """Group By with sum/count/rows/mean/min/max, folded chunk by chunk into per-group partials."""
+
+    def __init__(self, keys: Sequence[str], aggregations: Dict[str, Tuple[str, str]]):
+        if not keys or not aggregations:
+            raise ValueError("Group By needs at least one key and one aggregation")
+        bad = [a for _, a in aggregations.values() if a not in AGGREGATIONS]
+        if bad:
+            raise ValueError(f"Unknown aggregations {bad}; use one of {AGGREGATIONS}")
+        self.keys = list(keys)
+        self.aggregations = dict(aggregations)  # output -> (column, aggregation)
+        self.name = f"Group By ({', '.join(self.keys)})"
+
+    def _partials(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        spec = {}
+        for out, (col, agg) in self.aggregations.items():
+            if agg in ("sum", "mean"):
+                spec[f"{out}__sum"] = (col, "sum")
+            if agg in ("count", "mean"):
+                spec[f"{out}__count"] = (col, "count")
+            if agg in ("min", "max"):
+                spec[f"{out}__{agg}"] = (col, agg)
+            if agg == "rows":
+                spec[f"{out}__rows"] = (col, "size")
+        return chunk.groupby(self.keys, sort=False, observed=True, dropna=False).agg(**spec)
+
+    @staticmethod
+    def _combine(state: pd.DataFrame, partial: pd.DataFrame) -> pd.DataFrame:
+        both = pd.concat([state, partial])
+        how = {c: c.rsplit("__", 1)[1] for c in both.columns}
+        how = {c: "sum" if a in ("count", "rows") else a for c, a in how.items()}
+        return both.groupby(level=list(range(both.index.nlevels)), sort=False, dropna=False).agg(how)
+
+    def __call__(self, chunks: Chunks) -> Chunks:
+        state: Optional[pd.DataFrame] = None
+        for chunk in chunks:
+            partial = self._partials(chunk)
+            state = partial if state is None else self._combine(state, partial)
+        if state is None:
+            yield pd.DataFrame(columns=self.keys + list(self.aggregations))
+            return
+        out = {}
+        for name, (_, agg) in self.aggregations.items():
+            if agg == "mean":
+                out[name] = state[f"{name}__sum"] / state[f"{name}__count"].where(state[f"{name}__count"] > 0)
+            else:
+                out[name] = state[f"{name}__{agg}"]
+        yield pd.DataFrame(out, index=state.index).reset_index()
+
+
+class Pivot:
+    """Spread ``columns`` values into new columns holding ``agg`` of ``values`` (blocking)."""
+
+    def __init__(self, index: Sequence[str], columns: str, values: str, agg: str = "sum"):
+        self.group = GroupBy(list(index) + [columns], {values: (values, agg)})
+        self.index = list(index)
+        self.columns = columns
+        self.values = values
+        self.name = f"Pivot Column ({columns})"
+
+    def __call__(self, chunks: Chunks) -> Chunks:
+        for grouped in self.group(chunks):
+            wide = grouped.pivot_table(index=self.index, columns=self.columns, values=self.values,
+                                       aggfunc="sum", observed=True, sort=False)
+            wide.columns = [str(c) for c in wide.columns]
+            yield wide.reset_index()
+
+
+# ----------------------------
+# Query
+# ----------------------------
+@dataclass
+class StepStats:
+    step: str
+    rows_in: int = 0
+    rows_out: int = 0
+    chunks: int = 0
+    seconds: float = 0.0      # self time, excluding upstream steps
+    cumulative: float = 0.0   # including upstream steps
+
+
+def _timed(chunks: Chunks, stats: StepStats, upstream: Optional[StepStats]) -> Chunks:
+    total = 0.0
+    while True:
+        started = perf_counter()
+        try:
+            chunk = next(chunks)
+        except StopIteration:
+            total += perf_counter() - started
+            break
+        total += perf_counter() - started
+        stats.rows_out += len(chunk)
+        stats.chunks += 1
+        yield chunk
+    stats.cumulative = total
+    stats.seconds = total - (upstream.cumulative if upstream else 0.0)
+    if upstream is not None:
+        stats.rows_in = upstream.rows_out
+
+
+class Query:
+    """Lazy recipe: a source followed by steps; every builder returns a new Query."""
+
+    def __init__(self, source: Callable[[], Chunks], steps: Tuple = ()):
+        self.source = source
+        self.steps = steps
+
+    # --- sources ---
+    @classmethod
+    def csv(cls, source: Source, chunk_rows: int = CHUNK_ROWS, delimiter: str = ",") -> "Query":
+        return cls(CsvSource(source, chunk_rows, delimiter))
+
+    @classmethod
+    def excel(cls, source: Source, chunk_rows: int = CHUNK_ROWS, sheet: Optional[str] = None) -> "Query":
+        return cls(ExcelSource(source, chunk_rows, sheet))
+
+    @classmethod
+    def file(cls, source: Source, file_name: str, chunk_rows: int = CHUNK_ROWS) -> "Query":
+        """CSV or Excel by extension; headers still need ``promote_headers()``."""
+        if file_name.lower().endswith((".xlsx", ".xlsm")):
+            return cls.excel(source, chunk_rows)
+        return cls.csv(source, chunk_rows)
+
+    @classmethod
+    def frame(cls, df: pd.DataFrame, chunk_rows: int = CHUNK_ROWS, name: str = "Source (table)") -> "Query":
+        return cls(FrameSource(df, chunk_rows, name))
+
+    # --- steps ---
+    def then(self, step: Callable[[Chunks], Chunks]) -> "Query":
+        return Query(self.source, self.steps + (step,))
+
+    def promote_headers(self) -> "Query":
+        return self.then(PromoteHeaders())
+
+    def change_types(self, types: Dict[str, str]) -> "Query":
+        return self.then(ChangeTypes(types))
+
+    def split_column(self, column: str, delimiter: str, parts: int = 2) -> "Query":
+        return self.then(SplitColumn(column, delimiter, parts))
+
+    def merge(self, right: "Query", on: Sequence[str], how: str = "left") -> "Query":
+        return self.then(Merge(right, on, how))
+
+    def append(self, *others: "Query") -> "Query":
+        return self.then(Append(others))
+
+    def group_by(self, keys: Sequence[str], aggregations: Dict[str, Tuple[str, str]]) -> "Query":
+        return self.then(GroupBy(keys, aggregations))
+
+    def pivot(self, index: Sequence[str], columns: str, values: str, agg: str = "sum") -> "Query":
+        return self.then(Pivot(index, columns, values, agg))
+
+    def unpivot(self, columns: Sequence[str] = (), keep: Sequence[str] = ()) -> "Query":
+        return self.then(Unpivot(columns, keep))
+
+    def fill_down(self, columns: Sequence[str]) -> "Query":
+        return self.then(FillDown(columns))
+
+    def remove_duplicates(self, columns: Sequence[str] = ()) -> "Query":
+        return self.then(RemoveDuplicates(columns))
+
+    # --- execution ---
+    @property
+    def step_names(self) -> List[str]:
+        return [s.name for s in (self.source,) + self.steps]
+
+    def chunks(self, stats: Optional[List[StepStats]] = None) -> Chunks:
+        """Run the recipe; ``stats`` (if given) is filled with one entry per step as chunks flow."""
+        out: Chunks = self.source()
+        upstream: Optional[StepStats] = None
+        for step in (None,) + self.steps:
+            if step is not None:
+                out = step(out)
+            if stats is not None:
+                s = StepStats(self.source.name if step is None else step.name)
+                stats.append(s)
+                out = _timed(out, s, upstream)
+                upstream = s
+        return out
+
+    def collect(self, stats: Optional[List[StepStats]] = None, limit: Optional[int] = None) -> pd.DataFrame:
+        """Materialize the result (or its first ``limit`` rows, stopping the stream early)."""
+        parts, n = [], 0
+        for chunk in self.chunks(stats):
+            parts.append(chunk)
+            n += len(chunk)
+            if limit is not None and n >= limit:
+                break
+        if not parts:
+            return pd.DataFrame()
+        out = pd.concat(parts, ignore_index=True)
+        return out if limit is None else out.head(limit)
+
+    def preview(self, rows: int = 50) -> pd.DataFrame:
+        return self.collect(limit=rows)
+
+    def write_csv(self, fh: BinaryIO, stats: Optional[List[StepStats]] = None) -> int:
+        """Stream the result to ``fh`` as CSV; returns the row count."""
+        n, header = 0, True
+        for chunk in self.chunks(stats):
+            fh.write(chunk.to_csv(index=False, header=header).encode("utf-8"))
+            header = False
+            n += len(chunk)
+        return n
+
+    def run(self, preview_rows: int = 1000, spool_bytes: int = 32 * 1024 * 1024
+            ) -> Tuple[pd.DataFrame, BinaryIO, List[StepStats]]:
+        """Full run into a spooled CSV file, keeping only the first ``preview_rows`` in memory."""
+        stats: List[StepStats] = []
+        fh = tempfile.SpooledTemporaryFile(max_size=spool_bytes)
+        head, n, header = [], 0, True
+        for chunk in self.chunks(stats):
+            if n < preview_rows:
+                head.append(chunk.head(preview_rows - n))
+            fh.write(chunk.to_csv(index=False, header=header).encode("utf-8"))
+            header = False
+            n += len(chunk)
+        fh.seek(0)
+        return (pd.concat(head, ignore_index=True) if head else pd.DataFrame()), fh, stats
+
+
+def infer_types(sample: pd.DataFrame) -> Dict[str, str]:
+    """Guess Change Types from a text preview, the way Power Query's type detection does."""
+    types = {}
+    for col in sample.columns:
+        values = sample[col].dropna().astype(str).str.strip()
+        values = values[values != ""]
+        if values.empty:
+            types[col] = "text"
+            continue
+        numeric = pd.to_numeric(values, errors="coerce")
+        if numeric.notna().all():
+            types[col] = "int" if (numeric == numeric.round()).all() and not values.str.contains(r"[.eE]").any() else "float"
+        elif values.str.lower().isin(["true", "false"]).all():
+            types[col] = "bool"
+        elif pd.to_datetime(values, errors="coerce", format="mixed").notna().all() and values.str.contains(r"[-/:]").all():
+            types[col] = "date"
+        else:
+            types[col] = "text"
+    return types
+
+
+def stats_frame(stats: Iterable[StepStats]) -> pd.DataFrame:
+    return pd.DataFrame([{"Step": s.step, "Rows in": s.rows_in, "Rows out": s.rows_out, "Chunks": s.chunks,
+                          "Time (ms)": round(s.seconds * 1000, 1)} for s in stats])
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Per-section profiling of App.py reruns.
+
+``section(name)`` times a block of the script with ``perf_counter`` and,
+when allocation tracing is on, records what the block allocated and its
+peak with ``tracemalloc``.  Profiling is off by default and then costs one
+session-state lookup per section.  It is switched on per session with
+``?perf=1`` (which also opens the Performance Analyzer in the sidebar) or
+for the whole process with ``HUB_PROFILE=1`` (timings) or
+``HUB_PROFILE=memory`` (timings and allocations), as the benchmarks do.
+
+tracemalloc slows every allocation several-fold, so timings taken while it
+is on overstate allocation-heavy sections.  It is also process-wide: with
+several profiled sessions running at once their allocations interleave,
+and every session runs slower while any one of them traces.  Tracing is
+stopped only when no session has asked for it within ``TRACE_IDLE_SECONDS``
+(a closed tab never says it is done).
+"""
+
+import functools
+import os
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from time import monotonic, perf_counter
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional
+
+import streamlit as st
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+PERF_QUERY_PARAM = "perf"
+PROFILE_ENV = "HUB_PROFILE"
+PROFILE_KEY = "_perf_profile"
+TRACE_KEY = "perf_trace_memory"
+TRACE_IDLE_SECONDS = 600
+
+_started_tracing = False  # tracemalloc was started here (and may be stopped here)
+_tracing_sessions: Dict[str, float] = {}  # session id -> last run that wanted tracing
+_tracing_lock = threading.Lock()
+
+
+@dataclass
+class SectionStats:
+    name: str
+    depth: int                       # nesting level, 0 for top-level sections
+    seconds: float = 0.0
+    allocated: Optional[int] = None  # net bytes still allocated when the section ended
+    peak: Optional[int] = None       # peak bytes above the level at section start
+
+
+@dataclass
+class RunProfile:
+    """Sections of one script run, in the order they started."""
+    trace_memory: bool
+    started: float = field(default_factory=perf_counter)
+    sections: Dict[str, SectionStats] = field(default_factory=dict)
+    # [traced bytes at start, highest traced bytes seen] per open section
+    _stack: List[Optional[List[int]]] = field(default_factory=list, repr=False)
+
+    @property
+    def elapsed(self) -> float:
+        return perf_counter() - self.started
+
+    def records(self) -> List[dict]:
+        return [{"section": s.name, "depth": s.depth, "ms": s.seconds * 1000,
+                 "alloc_kb": None if s.allocated is None else s.allocated / 1024,
+                 "peak_kb": None if s.peak is None else s.peak / 1024}
+                for s in self.sections.values()]
+
+    def frame(self) -> "pd.DataFrame":
+        import pandas as pd  # the app imports pandas after its first paint
+
+        total = self.elapsed
+        return pd.DataFrame([{
+            "Section": "  " * s.depth + s.name,
+            "ms": round(s.seconds * 1000, 1),
+            "Share": f"{s.seconds / total:.0%}" if total else "",
+            "Alloc (KB)": None if s.allocated is None else round(s.allocated / 1024),
+            "Peak (KB)": None if s.peak is None else round(s.peak / 1024),
+        } for s in self.sections.values()], columns=["Section", "ms", "Share", "Alloc (KB)", "Peak (KB)"])
+
+
+def _mode() -> str:
+    mode = os.environ.get(PROFILE_ENV, "").strip().lower()
+    return "" if mode in ("", "0", "off") else mode
+
+
+def panel_enabled() -> bool:
+    return st.query_params.get(PERF_QUERY_PARAM) == "1"
+
+
+def _session_id() -> str:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else ""
+
+
+def _want_tracing(session: str, on: bool) -> bool:
+    """Record this session's wish; True while any session wants tracing."""
+    now = monotonic()
+    with _tracing_lock:
+        if on:
+            _tracing_sessions[session] = now
+        else:
+            _tracing_sessions.pop(session, None)
+        for sid, seen in list(_tracing_sessions.items()):
+            if now - seen > TRACE_IDLE_SECONDS:
+                del _tracing_sessions[sid]
+        return bool(_tracing_sessions)
+
+
+def _set_tracing(on: bool) -> None:
+    global _started_tracing
+    if on and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracing = True
+    elif not on and _started_tracing and tracemalloc.is_tracing():
+        tracemalloc.stop()
+        _started_tracing = False
+
+
+def start_run() -> Optional[RunProfile]:
+    """Begin profiling this script run, or return None when profiling is off."""
+    mode, requested = _mode(), panel_enabled()
+    trace = mode == "memory" or (requested and bool(st.session_state.get(TRACE_KEY, False)))
+    others = _want_tracing(_session_id(), trace)  # never stop another session's trace
+    if not (mode or requested):
+        st.session_state.pop(PROFILE_KEY, None)
+        _set_tracing(others)
+        return None
+    _set_tracing(trace or others)
+    profile = RunProfile(trace)
+    st.session_state[PROFILE_KEY] = profile
+    return profile
+
+
+def current_profile() -> Optional[RunProfile]:
+    try:
+        return st.session_state.get(PROFILE_KEY)
+    except Exception:  # no script run context (bare imports, worker threads)
+        return None
+
+
+@contextmanager
+def section(name: str) -> Iterator[None]:
+    """Time (and optionally trace allocations of) the enclosed block as ``name``.
+
+    A section that runs again in the same profile, e.g. a tab's fragment
+    rerun, replaces its previous figures and keeps its position.
+    """
+    profile = current_profile()
+    if profile is None:
+        yield
+        return
+    stack = profile._stack
+    stats = profile.sections.setdefault(name, SectionStats(name, len(stack)))
+    frame = None
+    if profile.trace_memory and tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        if stack and stack[-1] is not None:
+            stack[-1][1] = max(stack[-1][1], peak)  # keep the parent's peak before resetting
+        tracemalloc.reset_peak()
+        frame = [current, current]
+    stack.append(frame)
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        stats.seconds = perf_counter() - started
+        stack.pop()
+        if frame is not None and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            frame[1] = max(frame[1], peak)
+            stats.allocated = current - frame[0]
+            stats.peak = frame[1] - frame[0]
+            if stack and stack[-1] is not None:
+                stack[-1][1] = max(stack[-1][1], frame[1])
+
+
+def profiled(name: str) -> Callable[[Callable], Callable]:
+    """Decorator form of :func:`section`."""
+    def wrap(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def run(*args, **kwargs):
+            with section(name):
+                return func(*args, **kwargs)
+        return run
+    return wrap
+
+
+def render_performance_panel(profile: RunProfile) -> None:
+    """Sidebar table of this run's sections, opened with ``?perf=1``."""
+    with st.sidebar.expander("Performance Analyzer", expanded=True):
+        st.toggle("Trace allocations (slower)", key=TRACE_KEY,
+                  help="tracemalloc: adds allocation columns but slows every section.")
+        st.caption(f"Script run so far: {profile.elapsed * 1000:,.0f} ms")
+        st.dataframe(profile.frame(), use_container_width=True, hide_index=True)
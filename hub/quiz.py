@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Quiz bank: loaded once per server process from a bundled JSON/CSV file.
+
+Questions are stored column-wise: every distinct string (question, option,
+explanation) lives once in a shared string table and the bank keeps only
+integer ids into it, plus small integer arrays for the correct answer and
+topic of each question.  ``MCQ`` objects are materialized on access.
+Duplicate questions (same text and options) are dropped at load time.
+"""
+
+import csv
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from hub.cache import cache_resource
+
+TOPICS: List[str] = ["Excel", "Power Query", "DAX", "Power BI"]
+DEFAULT_BANK_PATH = os.path.join(os.path.dirname(__file__), "assets", "quiz_bank.json")
+
+
+@dataclass(frozen=True, slots=True)
+class MCQ:
+    question: str
+    options: Tuple[str, ...]
+    correct_index: int
+    explanation: str = ""
+    topic: str = "Excel"
+
+
+class QuizBank:
+    """Compact, deduplicated, read-only collection of MCQs."""
+
+    def __init__(self, questions: Iterable[MCQ]):
+        strings: List[str] = []
+        ids: Dict[str, int] = {}
+
+        def intern(text: str) -> int:
+            if text not in ids:
+                ids[text] = len(strings)
+                strings.append(text)
+            return ids[text]
+
+        seen = set()
+        rows: List[Tuple[int, Tuple[int, ...], int, int, int]] = []
+        for q in questions:
+            if q.topic not in TOPICS:
+                raise ValueError(f"Unknown topic {q.topic!r} for question {q.question!r}")
+            if not 0 <= q.correct_index < len(q.options):
+                raise ValueError(f"correct_index out of range for question {q.question!r}")
+            key = (q.question.strip().casefold(), tuple(o.strip().casefold() for o in q.options))
+            if key in seen:
+                continue
+            seen.add(key)
+            rows.append((intern(q.question), tuple(intern(o) for o in q.options),
+                         q.correct_index, intern(q.explanation), TOPICS.index(q.topic)))
+
+        width = max((len(r[1]) for r in rows), default=0)
+        self.strings: Tuple[str, ...] = tuple(strings)
+        self.question_ids = np.array([r[0] for r in rows], dtype=np.int32)
+        self.option_ids = np.full((len(rows), width), -1, dtype=np.int32)
+        for i, r in enumerate(rows):
+            self.option_ids[i, :len(r[1])] = r[1]
+        self.correct_index = np.array([r[2] for r in rows], dtype=np.int8)
+        self.explanation_ids = np.array([r[3] for r in rows], dtype=np.int32)
+        self.topic_codes = np.array([r[4] for r in rows], dtype=np.int8)
+        for arr in (self.question_ids, self.option_ids, self.correct_index, self.explanation_ids, self.topic_codes):
+            arr.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.question_ids)
+
+    def __getitem__(self, i: int) -> MCQ:
+        s = self.strings
+        options = tuple(s[j] for j in self.option_ids[i] if j >= 0)
+        return MCQ(s[self.question_ids[i]], options, int(self.correct_index[i]),
+                   s[self.explanation_ids[i]], TOPICS[self.topic_codes[i]])
+
+    def __iter__(self) -> Iterator[MCQ]:
+        return (self[i] for i in range(len(self)))
+
+    def sample(self, n: int, seed: int) -> List[int]:
+        """``n`` distinct question positions, reproducible for a given seed."""
+        rng = np.random.default_rng(seed)
+        return sorted(rng.choice(len(self), size=min(n, len(self)), replace=False).tolist())
+
+    def topic_counts(self) -> Dict[str, int]:
+        counts = np.bincount(self.topic_codes, minlength=len(TOPICS))
+        return dict(zip(TOPICS, counts.tolist()))
+
+
+# ----------------------------
+# Loading
+# ----------------------------
+def _from_json(path: str) -> List[MCQ]:
+    with open(path, encoding="utf-8") as fh:
+        records = json.load(fh)
+    return [MCQ(r["question"], tuple(r["options"]), int(r["correct_index"]),
+                r.get("explanation", ""), r.get("topic", "Excel")) for r in records]
+
+
+def _from_csv(path: str) -> List[MCQ]:
+    """Columns: topic, question, option_1..option_N, correct_index, explanation."""
+    out = []
+    with open(path, encoding="utf-8", newline="") as fh:
+        for r in csv.DictReader(fh):
+            option_cols: Sequence[str] = sorted((k for k in r if k.startswith("option_")),
+                                                key=lambda k: int(k.split("_")[1]))
+            options = tuple(r[k] for k in option_cols if r[k])
+            out.append(MCQ(r["question"], options, int(r["correct_index"]),
+                           r.get("explanation") or "", r.get("topic") or "Excel"))
+    return out
+
+
+def read_questions(path: str) -> List[MCQ]:
+    if path.lower().endswith(".csv"):
+        return _from_csv(path)
+    return _from_json(path)
+
+
+@cache_resource("Quiz bank", show_spinner="Loading quiz bank...")
+def load_quiz_bank(path: str = DEFAULT_BANK_PATH) -> QuizBank:
+    """One shared bank per server process (and per source file)."""
+    return QuizBank(read_questions(path))
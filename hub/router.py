@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Tab registry: each page section is a render function and only the active
+one runs.
+
+``st.tabs`` executes the body of every tab on every rerun even though only
+one is visible.  Here the active section is picked with a horizontal radio
+and its render function is wrapped in ``st.fragment``, so widget changes
+inside a section rerun just that section and the cost of a rerun does not
+depend on how many sections are registered.  Each body is profiled as
+``Tab: <name>`` (see hub/profiling.py).
+
+Streamlit drops the state of a keyed widget at the end of any run that
+does not draw it, so a section's filters would reset whenever another
+section is shown.  A section lists the keys (or key prefixes) of its
+widgets as ``state``; while it is hidden, those values are re-saved on
+every run and the widgets pick them up again when it comes back.  File
+uploads and buttons cannot be set this way, so they still reset.
+"""
+
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import streamlit as st
+
+from hub.profiling import profiled
+
+NAV_CONTAINER_KEY = "tab_nav"  # CSS hook: .st-key-tab_nav
+
+
+class TabRegistry:
+    """Ordered ``name -> render function`` map."""
+
+    def __init__(self):
+        self._tabs: Dict[str, Callable[[], None]] = {}
+        self._state: Dict[str, Tuple[str, ...]] = {}
+
+    def tab(self, name: str, state: Sequence[str] = ()) -> Callable[[Callable[[], None]], Callable[[], None]]:
+        """Decorator registering ``func`` as the body of section ``name``.
+
+        ``state``: widget keys or key prefixes whose values survive while the
+        section is hidden (never file uploaders or buttons).
+        """
+        def register(func: Callable[[], None]) -> Callable[[], None]:
+            self._tabs[name] = st.fragment(profiled(f"Tab: {name}")(func))
+            self._state[name] = tuple(state)
+            return func
+        return register
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._tabs)
+
+    def render(self, key: str = "active_tab") -> str:
+        """Draw the section switcher and run only the selected section."""
+        with st.container(key=NAV_CONTAINER_KEY):
+            active = st.radio("Section", self.names, horizontal=True, key=key,
+                              label_visibility="collapsed")
+        keep_widget_state(p for name, prefixes in self._state.items() if name != active for p in prefixes)
+        self._tabs[active]()
+        return active
+
+
+def keep_widget_state(prefixes) -> None:
+    """Re-save widget values under ``prefixes`` so they outlive a run that does not draw their widgets."""
+    prefixes = tuple(prefixes)
+    if not prefixes:
+        return
+    for key in list(st.session_state.keys()):
+        if isinstance(key, str) and key.startswith(prefixes):
+            st.session_state[key] = st.session_state[key]
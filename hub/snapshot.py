@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+On-disk snapshots of the generated sample datasets.
+
+A restarted server would otherwise regenerate every frame it serves.  A
+snapshot stores a frame as one ``.npy`` file per column (categoricals as
+their integer codes) and loads it with ``mmap_mode="r"``: nothing is read
+until a page is touched, pages come from the OS page cache and are shared
+by every server process on the host, and the arrays are read-only just
+like freshly built ones (see hub/datasets.py).
+
+Snapshots are keyed by a hash of the builder's source file, its arguments,
+the NumPy/pandas versions and ``SNAPSHOT_FORMAT``, so editing the generator
+or the on-disk layout invalidates them.  After each write, stale versions of
+the same dataset are deleted and at most ``SNAPSHOT_KEEP`` snapshots (the
+most recently used) are kept per dataset name.
+They live in ``$HUB_SNAPSHOT_DIR`` (default ``~/.cache/excel-powerbi-hub``;
+``off`` disables them).  Any failure to read or write one falls back to
+building the frame in memory.  Precompute them when building an image:
+
+    python -m hub.snapshot --rows 100000 1000000
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_ENV = "HUB_SNAPSHOT_DIR"
+SNAPSHOT_MIN_ROWS = 100_000  # smaller frames are rebuilt: it takes about as long as opening files
+SNAPSHOT_FORMAT = 1  # bump whenever write_frame/read_frame change the layout
+SNAPSHOT_KEEP = 4    # per dataset name, e.g. the sales sizes in SALES_ROW_OPTIONS
+_META = "meta.json"
+
+
+def snapshot_dir() -> Optional[Path]:
+    configured = os.environ.get(SNAPSHOT_ENV, "").strip()
+    if configured.lower() in ("off", "0", "false"):
+        return None
+    if configured:
+        return Path(configured)
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(cache_home) / "excel-powerbi-hub"
+
+
+def snapshot_key(build: Callable, *args) -> str:
+    digest = hashlib.sha256()
+    digest.update(Path(inspect.getsourcefile(build)).read_bytes())
+    digest.update(repr((SNAPSHOT_FORMAT, build.__qualname__, args, np.__version__, pd.__version__)).encode())
+    return digest.hexdigest()[:16]
+
+
+def _prefix(name: str, *args) -> str:
+    """Directory name prefix shared by every version of one dataset."""
+    return "-".join([name, *map(str, args)]) + "-"
+
+
+def prune(root: Path, name: str, keep: Path, *args) -> None:
+    """Delete other versions of this dataset and all but the most recently used ``name`` snapshots.
+
+    A process still mapping a deleted snapshot keeps reading it (POSIX keeps
+    unlinked files alive); where deletion fails the directory is left alone.
+    """
+    others = [p for p in root.glob(f"{name}-*") if p.is_dir() and p != keep]
+    stale = [p for p in others if p.name.startswith(_prefix(name, *args))]
+    rest = sorted((p for p in others if p not in stale), key=lambda p: p.stat().st_mtime, reverse=True)
+    for path in stale + rest[SNAPSHOT_KEEP - 1:]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+# ----------------------------
+# Frame <-> column files
+# ----------------------------
+def write_frame(df: pd.DataFrame, path: Path) -> None:
+    """Write ``df`` to directory ``path`` atomically (a concurrent writer may win)."""
+    if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+        raise TypeError("only frames with a default RangeIndex can be snapshotted")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(prefix=f".{path.name}-", dir=path.parent))
+    try:
+        columns = []
+        for i, (name, col) in enumerate(df.items()):
+            entry = {"name": name, "file": f"{i}.npy"}
+            if isinstance(col.dtype, pd.CategoricalDtype):
+                values = col.cat.codes.to_numpy()
+                entry.update(categories=col.cat.categories.tolist(), ordered=bool(col.cat.ordered))
+            elif pd.api.types.is_string_dtype(col.dtype):
+                values = col.to_numpy(dtype=str)  # fixed-width unicode, so it can be mapped
+            else:
+                values = col.to_numpy()
+            np.save(tmp / entry["file"], values, allow_pickle=False)
+            columns.append(entry)
+        (tmp / _META).write_text(json.dumps({"rows": len(df), "columns": columns}))
+        tmp.chmod(0o755)  # mkdtemp is owner-only; other server processes read it too
+        try:
+            os.replace(tmp, path)
+        except OSError:  # another process published it first
+            pass
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def read_frame(path: Path) -> pd.DataFrame:
+    """Memory-mapped, read-only frame from a directory written by :func:`write_frame`."""
+    meta = json.loads((path / _META).read_text())
+    data = {}
+    for entry in meta["columns"]:
+        values = np.asarray(np.load(path / entry["file"], mmap_mode="r", allow_pickle=False))
+        if "categories" in entry:
+            dtype = pd.CategoricalDtype(entry["categories"], ordered=entry["ordered"])
+            values = pd.Categorical.from_codes(values, dtype=dtype, validate=False)
+        data[entry["name"]] = values
+    df = pd.DataFrame(data, copy=False)
+    if len(df) != meta["rows"]:
+        raise ValueError(f"snapshot {path} is truncated")
+    return df
+
+
+def snapshot_frame(name: str, build: Callable[..., pd.DataFrame], *args) -> pd.DataFrame:
+    """``build(*args)``, read from (or saved to) the snapshot directory when enabled."""
+    root = snapshot_dir()
+    if root is None:
+        return build(*args)
+    path = root / (_prefix(name, *args) + snapshot_key(build, *args))
+    if (path / _META).exists():
+        try:
+            df = read_frame(path)
+            os.utime(path)  # "recently used", for prune
+            return df
+        except (OSError, ValueError, KeyError):
+            pass  # unreadable snapshot: rebuild (and rewrite) below
+    df = build(*args)
+    try:
+        if path.exists():
+            shutil.rmtree(path, ignore_errors=True)
+        write_frame(df, path)
+        prune(root, name, path, *args)
+    except (OSError, TypeError):
+        pass  # read-only or full disk: serve the in-memory frame
+    return df
+
+
+def main() -> None:
+    from hub.datasets import DEFAULT_SEED, SALES_ROW_OPTIONS, make_sales_df
+
+    parser = argparse.ArgumentParser(description="Precompute dataset snapshots.")
+    parser.add_argument("--rows", type=int, nargs="+", help="sales dataset sizes",
+                        default=[n for n in SALES_ROW_OPTIONS if n >= SNAPSHOT_MIN_ROWS])
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+    if snapshot_dir() is None:
+        parser.error(f"snapshots are disabled by {SNAPSHOT_ENV}")
+    for n in args.rows:
+        started = perf_counter()
+        snapshot_frame("sales", make_sales_df, n, args.seed)
+        print(f"sales rows={n:,}: {perf_counter() - started:.2f} s")
+    print(f"snapshots in {snapshot_dir()}")
+
+
+if __name__ == "__main__":
+    main()
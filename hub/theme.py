@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Theme stylesheet generation.
+
+A theme is an accent colour plus the gradients used for the section
+switcher.  The ``<style>`` block is generated from those values (one rule
+per gradient instead of hand-written per-tab rules), whitespace-minified,
+and memoized per theme, so switching accents costs a dict lookup and the
+page receives the smallest stylesheet that expresses the theme.
+"""
+
+import re
+from functools import lru_cache
+from string import Template
+from typing import Dict, NamedTuple, Tuple
+
+import streamlit as st
+
+from hub.router import NAV_CONTAINER_KEY
+
+DEFAULT_ACCENT = "#8A2BE2"
+
+TAB_GRADIENTS: Tuple[str, ...] = (
+    "linear-gradient(135deg, #8A2BE2 0%, #6A5ACD 100%)",
+    "linear-gradient(135deg, #FF8C00 0%, #FF6B6B 100%)",
+    "linear-gradient(135deg, #00B3B3 0%, #1E90FF 100%)",
+    "linear-gradient(135deg, #39D353 0%, #2AB3A6 100%)",
+    "linear-gradient(135deg, #FF3B7F 0%, #FF7F50 100%)",
+    "linear-gradient(135deg, #9966FF 0%, #8A2BE2 100%)",
+    "linear-gradient(135deg, #1E90FF 0%, #00BFFF 100%)",
+    "linear-gradient(135deg, #FF6B6B 0%, #FFA07A 100%)",
+    "linear-gradient(135deg, #2AB3A6 0%, #20C997 100%)",
+    "linear-gradient(135deg, #FFD166 0%, #FF8C00 100%)",
+    "linear-gradient(135deg, #6EE7B7 0%, #3B82F6 100%)",
+    "linear-gradient(135deg, #F472B6 0%, #8B5CF6 100%)",
+)
+
+ACCENTS: Dict[str, str] = {
+    "Aurora": "#8A2BE2", "Mango": "#FF8C00", "Lagoon": "#00B3B3",
+    "Rose": "#FF3B7F", "Lime": "#39D353", "Ocean": "#1E90FF", "Sunset": "#FF6B6B",
+}
+
+
+class Theme(NamedTuple):
+    accent: str = DEFAULT_ACCENT
+    gradients: Tuple[str, ...] = TAB_GRADIENTS
+
+
+def gradient(start: str, end: str) -> str:
+    return f"linear-gradient(135deg, {start} 0%, {end} 100%)"
+
+
+BASE_CSS = Template("""
+:root { --accent: $accent; }
+.stApp {
+    background: radial-gradient(900px 600px at 10% -10%, rgba(138,43,226,0.08), transparent 40%),
+                radial-gradient(900px 600px at 110% 10%, rgba(30,144,255,0.06), transparent 40%),
+                linear-gradient(135deg, #071018, #081020 60%);
+    color: #e8eef8;
+    font-family: 'Segoe UI', Roboto, Helvetica, Arial, sans-serif;
+}
+.card {
+    background: rgba(255,255,255,0.03);
+    border: 1px solid rgba(255,255,255,0.05);
+    padding: 14px;
+    border-radius: 12px;
+    margin-bottom: 12px;
+}
+.headline { font-weight: 700; }
+.divider { height: 1px; background: rgba(255,255,255,0.04); margin: 12px 0; border-radius: 2px; }
+.stButton>button {
+    background: var(--accent) !important;
+    color: white !important;
+    border-radius: 10px !important;
+}
+$nav [data-testid="stRadioOption"] { padding: 4px 12px; border-radius: 10px; color: white; }
+""")
+
+
+def _minify(css: str) -> str:
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};,>])\s*", r"\1", css).strip()
+
+
+@lru_cache(maxsize=64)
+def build_css(theme: Theme) -> str:
+    """Complete ``<style>`` block for ``theme`` (memoized per theme)."""
+    nav = f".st-key-{NAV_CONTAINER_KEY}"
+    rules = [BASE_CSS.substitute(accent=theme.accent, nav=nav)]
+    if len(set(theme.gradients)) == 1:
+        rules.append(f'{nav} [data-testid="stRadioOption"] {{ background: {theme.gradients[0]}; }}')
+    else:
+        rules += [f'{nav} [data-testid="stRadioGroup"] > :nth-child({i}) [data-testid="stRadioOption"] '
+                  f'{{ background: {g}; }}' for i, g in enumerate(theme.gradients, start=1)]
+    return f"<style>{_minify(''.join(rules))}</style>"
+
+
+def apply_theme(theme: Theme) -> None:
+    """Emit the stylesheet; call once per full script run.
+
+    Fragment reruns (see hub/router.py) keep the element from the last full
+    run, so the stylesheet is not re-sent for in-section interactions.
+    """
+    st.markdown(build_css(theme), unsafe_allow_html=True)
+
+
+def themes() -> Dict[str, Theme]:
+    """Built-in accents followed by the session's saved custom themes."""
+    out = {name: Theme(accent) for name, accent in ACCENTS.items()}
+    out.update(st.session_state.get("custom_themes", {}))
+    return out
+
+
+def save_custom_theme(name: str, accent: str, start: str, end: str) -> None:
+    custom = dict(st.session_state.get("custom_themes", {}))
+    custom[name] = Theme(accent, (gradient(start, end),))
+    st.session_state.custom_themes = custom
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""Roster ZIPs must be accepted by st.download_button."""
+
+import io
+import zipfile
+from datetime import date
+
+import pytest
+from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+
+from hub import certificate
+
+ROSTER = [("Asha Rao", 0.9, date(2025, 1, 1)), ("Ben", 0.75, date(2025, 1, 2)), ("", 1.0, date(2025, 1, 3))]
+
+
+@pytest.mark.parametrize("fmt", list(certificate.FORMATS))
+def test_roster_zip_is_downloadable(fmt):
+    data, _ = convert_data_to_bytes_and_infer_mime(certificate.roster_zip(ROSTER, fmt=fmt),
+                                                   RuntimeError("unsupported download data"))
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        names = zf.namelist()
+    ext = certificate.FORMATS[fmt][0]
+    assert names == [f"00001_Asha_Rao.{ext}", f"00002_Ben.{ext}", f"00003_learner.{ext}"]
+
+
+def test_short_rosters_render_in_process():
+    assert certificate.default_workers(len(ROSTER)) == 1
+    assert 1 <= certificate.default_workers(10_000) <= certificate.MAX_WORKERS
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""The lab measures in hub/dax.py against their pandas equivalents, plus error paths."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hub.dax import LAB_MEASURES, DaxError, DaxModel, date_table
+from hub.datasets import MONTHS, make_hr_df, make_sales_df
+
+SLICERS = {
+    "none": {},
+    "month": {("Date", "Month"): ["Mar"]},
+    "region": {("Sales", "Region"): ["North", "East"]},
+    "person+region": {("Sales", "Person"): ["Isha"], ("Sales", "Region"): ["South"]},
+}
+
+
+@pytest.fixture(scope="module")
+def sales():
+    return make_sales_df(10_000, 7)
+
+
+@pytest.fixture(scope="module")
+def hr():
+    return make_hr_df(500, 7)
+
+
+@pytest.fixture(scope="module")
+def model(sales, hr):
+    return DaxModel(tables={"Sales": sales, "Date": date_table(), "HR": hr},
+                    relationships=[("Sales", "Month", "Date", "Month")],
+                    date_table=("Date", "Date"), measures=LAB_MEASURES)
+
+
+def visible(sales: pd.DataFrame, slicers: dict) -> pd.DataFrame:
+    mask = np.ones(len(sales), dtype=bool)
+    for (_, column), values in slicers.items():
+        mask &= sales[column].isin(values).to_numpy()
+    return sales[mask]
+
+
+def by_month(df: pd.DataFrame) -> pd.Series:
+    return df.groupby("Month", observed=False)["Revenue"].sum().astype(float)
+
+
+# ----------------------------
+# Measures vs pandas
+# ----------------------------
+SCALARS = {
+    "Total Revenue": lambda s, hr: s["Revenue"].sum(),
+    "Total Units": lambda s, hr: s["Units"].sum(),
+    "Avg Price": lambda s, hr: s["Revenue"].sum() / s["Units"].sum(),
+    "North Share": lambda s, hr: s.loc[s["Region"] == "North", "Revenue"].sum() / s["Revenue"].sum(),
+    "Big Orders": lambda s, hr: (s["Units"] >= 50).sum(),
+    "Headcount": lambda s, hr: len(hr),
+    "Avg Salary": lambda s, hr: hr["Salary"].mean(),
+    "Senior Share": lambda s, hr: (hr["Level"] == "Senior").mean(),
+}
+
+
+@pytest.mark.parametrize("slicer", ["none", "region", "person+region"])
+@pytest.mark.parametrize("measure", list(SCALARS))
+def test_scalar_measures(model, sales, hr, measure, slicer):
+    slicers = SLICERS[slicer]
+    if measure == "North Share":  # both CALCULATE filters replace the Region slicer
+        expected = SCALARS[measure](visible(sales, {k: v for k, v in slicers.items() if k[1] != "Region"}), hr)
+    else:
+        expected = SCALARS[measure](visible(sales, slicers), hr)
+    assert model.evaluate(f"[{measure}]", slicers) == pytest.approx(float(expected))
+
+
+def test_time_intelligence_by_month(model, sales):
+    monthly = by_month(sales)
+    cases = {
+        "Total Revenue": monthly,
+        "Prev Month Revenue": monthly.shift(1),
+        "MoM Growth": monthly.pct_change(),
+        "Running Total": monthly.cumsum(),
+        "YoY Revenue": pd.Series(np.nan, index=monthly.index),
+    }
+    for measure, expected in cases.items():
+        got = model.evaluate(f"[{measure}]", by=("Date", "Month"))
+        assert got["Month"].tolist() == MONTHS
+        np.testing.assert_allclose(got["Value"].to_numpy(dtype=float), expected.to_numpy(), err_msg=measure)
+
+
+@pytest.mark.parametrize("slicer", ["month", "region"])
+def test_time_intelligence_under_slicers(model, sales, slicer):
+    slicers = SLICERS[slicer]
+    monthly = by_month(visible(sales, {k: v for k, v in slicers.items() if k[0] == "Sales"}))
+    if slicer == "month":  # Mar: previous month is Feb, running total is Jan..Mar
+        assert model.evaluate("[Prev Month Revenue]", slicers) == pytest.approx(monthly["Feb"])
+        assert model.evaluate("[Running Total]", slicers) == pytest.approx(monthly[:"Mar"].sum())
+        assert model.evaluate("[MoM Growth]", slicers) == pytest.approx(monthly["Mar"] / monthly["Feb"] - 1)
+    else:
+        got = model.evaluate("[MoM Growth]", slicers, by=("Date", "Month"))["Value"].to_numpy(dtype=float)
+        np.testing.assert_allclose(got, monthly.pct_change().to_numpy())
+
+
+def test_top_people(model, sales):
+    got = model.evaluate("[Top 3 People]")
+    expected = sales.groupby("Person", observed=True)["Revenue"].sum().nlargest(3)
+    assert got["Person"].tolist() == expected.index.tolist()
+    np.testing.assert_allclose(got["Value"].to_numpy(dtype=float), expected.to_numpy(dtype=float))
+
+
+def test_custom_measure_definition(model, sales):
+    got = model.evaluate("[Per Order]", measures={"Per Order": "DIVIDE([Total Revenue], COUNTROWS(Sales))"})
+    assert got == pytest.approx(sales["Revenue"].mean())
+
+
+# ----------------------------
+# DIVIDE and BLANK
+# ----------------------------
+@pytest.mark.parametrize("expression, expected", [
+    ("DIVIDE(5, 2)", 2.5),
+    ("DIVIDE(5, 0)", None),
+    ("DIVIDE(5, 0, -1)", -1.0),
+    ("DIVIDE(5, BLANK(), 7)", 7.0),
+    ("DIVIDE(5, COUNTROWS(FILTER(Sales, Sales[Units] > 100)))", None),
+    ("DIVIDE(5, CALCULATE(COUNTROWS(Sales), Sales[Units] > 100), 0)", 0.0),
+])
+def test_divide(model, expression, expected):
+    assert model.evaluate(expression) == expected
+
+
+def test_divide_by_zero_per_row(model):
+    got = model.evaluate("DIVIDE([Total Units], CALCULATE(COUNTROWS(Sales), Sales[Units] > 100), -1)",
+                         by=("Date", "Month"))
+    assert (got["Value"] == -1).all()
+
+
+# ----------------------------
+# Error paths
+# ----------------------------
+@pytest.mark.parametrize("expression, message", [
+    ("SUM(Sales[Nope])", "Unknown column Sales[Nope]"),
+    ("SUM(Nope[Units])", "Unknown table"),
+    ("[Nope]", "Unknown measure"),
+    ("SUM(HR[Dept])", "HR[Dept] is not numeric"),
+    ("AVERAGE(HR[Level])", "HR[Level] is not numeric"),
+    ("AVERAGE(Sales[Person])", "Sales[Person] is not numeric"),
+    ("SUM(Sales[Units]", "Expected ')'"),
+    ("Sales[Units]", "cannot be determined"),
+    ("\"a\" * 2", "Cannot evaluate"),
+])
+def test_errors(model, expression, message):
+    with pytest.raises(DaxError, match=message.replace("[", r"\[").replace("(", r"\(").replace(")", r"\)")):
+        model.evaluate(expression)
+
+
+def test_non_numeric_aggregate_by_month(model):
+    with pytest.raises(DaxError, match="not numeric"):
+        model.evaluate("SUM(Sales[Region])", by=("Date", "Month"))
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""Vectorized cohort grading against a plain pandas computation."""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hub.grading import OPTION_LETTERS, UNANSWERED, grade_cohort, read_answer_sheets
+from hub.quiz import DEFAULT_BANK_PATH, TOPICS, QuizBank, read_questions
+
+# valid answers plus padded, blank, out-of-range and non-ASCII cells
+CELLS = ["A", "B", "C", "D", "a", "d", "0", "3", " B", "c ", "\tD", "", "  ", "Z", "AB", "10", "é", "Ａ"]
+
+
+@pytest.fixture(scope="module")
+def bank():
+    return QuizBank(read_questions(DEFAULT_BANK_PATH))
+
+
+@pytest.fixture(scope="module")
+def sheet(bank):
+    rng = np.random.default_rng(3)
+    questions = sorted(rng.choice(len(bank), 15, replace=False))
+    df = pd.DataFrame(rng.choice(CELLS, (40, len(questions))), columns=[f"Q{q}" for q in questions])
+    df.insert(0, "learner", [f"L{i:02d}" for i in range(len(df))])
+    return df
+
+
+def expected(bank: QuizBank, sheet: pd.DataFrame):
+    lookup = {c: i for i, letter in enumerate(OPTION_LETTERS) for c in (letter, letter.lower(), str(i))}
+    long = sheet.melt(id_vars="learner", var_name="col", value_name="cell")
+    long["q"] = long["col"].str[1:].astype(int)
+    long["answer"] = long["cell"].str.strip().map(lookup).fillna(UNANSWERED).astype(int)
+    long["correct"] = long["answer"] == bank.correct_index[long["q"]]
+    long["topic"] = [TOPICS[c] for c in bank.topic_codes[long["q"]]]
+    scores = long.groupby("learner")["correct"].mean()
+    by_topic = long.pivot_table(index="learner", columns="topic", values="correct", aggfunc="mean")
+    return long, scores, by_topic.reindex(columns=TOPICS), long.groupby("topic")["correct"].mean()
+
+
+def test_cohort_matches_pandas(bank, sheet):
+    data = sheet.to_csv(index=False).encode("utf-8")
+    report = grade_cohort(bank, *read_answer_sheets(io.BytesIO(data), bank))
+    long, scores, by_topic, cohort = expected(bank, sheet)
+
+    got = report.learners
+    np.testing.assert_allclose(got["Score"].to_numpy(), scores.reindex(got.index).to_numpy())
+    np.testing.assert_allclose(got[TOPICS].to_numpy(dtype=float),
+                               by_topic.reindex(got.index).to_numpy(dtype=float))
+    topics = report.topics.set_index("Topic")
+    np.testing.assert_allclose(topics["Accuracy"].to_numpy(dtype=float),
+                               cohort.reindex(TOPICS).to_numpy(dtype=float))
+    assert (long["answer"] != UNANSWERED).any() and (long["answer"] == UNANSWERED).any()
+
+
+def test_cell_parsing(bank):
+    cells = pd.DataFrame({"learner": ["x"], "Q0": [" b"], "Q1": ["c\t"], "Q2": ["é"], "Q3": [""], "Q4": ["AB"]})
+    _, _, answers = read_answer_sheets(io.BytesIO(cells.to_csv(index=False).encode("utf-8")), bank)
+    assert answers.tolist() == [[1, 2, UNANSWERED, UNANSWERED, UNANSWERED]]
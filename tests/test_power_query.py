@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""Streaming Power Query operators against pandas, with chunks small enough to split every run."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hub.power_query import Query
+
+CHUNK = 7
+
+
+@pytest.fixture(scope="module")
+def df():
+    rng = np.random.default_rng(11)
+    n = 60
+    region = rng.choice(["North", "South", "East"], n).astype(object)
+    region[rng.random(n) < 0.15] = None                  # NaN group keys
+    units = rng.integers(1, 9, n).astype(float)
+    units[rng.random(n) < 0.2] = np.nan                  # NaN values inside groups
+    person = pd.Series(rng.choice(["Ana", "Bo"], n), dtype=object)
+    person[[0, 1]] = None                                # leading nulls: nothing to fill from
+    person[10:25] = None                                 # null run spanning two chunk boundaries
+    return pd.DataFrame({"Region": region, "Person": person, "Units": units,
+                         "Team": rng.choice(["A", "B"], n)})
+
+
+def run(query: Query) -> pd.DataFrame:
+    return query.collect().reset_index(drop=True)
+
+
+def test_fill_down(df):
+    got = run(Query.frame(df, chunk_rows=CHUNK).fill_down(["Person", "Units"]))
+    expected = df.assign(Person=df["Person"].ffill(), Units=df["Units"].ffill())
+    pd.testing.assert_frame_equal(got, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize("columns", [[], ["Region"], ["Region", "Team"]])
+def test_remove_duplicates(df, columns):
+    got = run(Query.frame(df, chunk_rows=CHUNK).remove_duplicates(columns))
+    expected = df.drop_duplicates(subset=columns or None).reset_index(drop=True)
+    pd.testing.assert_frame_equal(got, expected)
+
+
+@pytest.mark.parametrize("keys", [["Region"], ["Region", "Team"]])
+def test_group_by(df, keys):
+    aggs = {"Total": ("Units", "sum"), "Values": ("Units", "count"), "Rows": ("Units", "rows"),
+            "Avg": ("Units", "mean"), "Low": ("Units", "min"), "High": ("Units", "max")}
+    got = run(Query.frame(df, chunk_rows=CHUNK).group_by(keys, aggs))
+    pandas_aggs = {k: (c, "size" if a == "rows" else a) for k, (c, a) in aggs.items()}
+    expected = df.groupby(keys, dropna=False, sort=False).agg(**pandas_aggs).reset_index()
+    assert got[keys].isna().any().any()                  # the NaN-key group survived the chunked fold
+    order = lambda f: f.sort_values(keys, na_position="last").reset_index(drop=True)
+    pd.testing.assert_frame_equal(order(got), order(expected), check_dtype=False)
+
+
+def test_chained_steps_match_single_chunk(df):
+    recipe = lambda q: q.fill_down(["Person"]).remove_duplicates(["Person", "Team"]).group_by(
+        ["Team"], {"Avg": ("Units", "mean"), "Rows": ("Units", "rows")})
+    small = run(recipe(Query.frame(df, chunk_rows=CHUNK)))
+    whole = run(recipe(Query.frame(df, chunk_rows=len(df))))
+    pd.testing.assert_frame_equal(small.sort_values("Team").reset_index(drop=True),
+                                  whole.sort_values("Team").reset_index(drop=True))
@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+"""Sanity checks on the bundled quiz bank."""
+
+import numpy as np
+
+from hub.quiz import DEFAULT_BANK_PATH, QuizBank, read_questions
+
+
+def test_answer_key_is_balanced():
+    bank = QuizBank(read_questions(DEFAULT_BANK_PATH))
+    width = bank.option_ids.shape[1]
+    share = np.bincount(bank.correct_index, minlength=width) / len(bank)
+    # no answer position should beat guessing by much (1 / width each)
+    assert share.max() < 1.5 / width, dict(zip("ABCD", share.round(2)))